@@ -11,4 +11,5 @@ station_handler = CacheHandler()
 
 station_handler.cache_stations_status()
 station_handler.cache_realtime_data()
-station_handler.cache_past_hourly_data()
\ No newline at end of file
+station_handler.cache_past_hourly_data()
+station_handler.close()
@@ -4,55 +4,225 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
 
 
-from flask import Blueprint, jsonify, request, current_app, send_file
-import json
+from flask import Blueprint, jsonify, request, current_app
+from collections import OrderedDict
+import hashlib
+import threading
+import time
 
 api = Blueprint('api', __name__)
 
+# Seconds during which a serialized response is reused. The cache files behind
+# the endpoints are only refreshed every few minutes.
+RESPONSE_CACHE_TTL = 60
+# Seconds during which an empty result is reused, so that a missing station does not
+# hit the cache files on every poll, while new data still shows up quickly.
+EMPTY_RESPONSE_CACHE_TTL = 5
+# Seconds during which browsers reuse a response without revalidating it
+RESPONSE_MAX_AGE = 60
+# Maximum number of serialized responses kept. The keys come from the request parameters,
+# so the least recently used responses are dropped beyond this size.
+RESPONSE_CACHE_SIZE = 512
+# Number of locks serializing the loading of responses. Keys are spread over a fixed pool,
+# so that concurrent requests for the same expired response wait for a single loader call
+# without keeping a lock per key ever requested.
+RESPONSE_LOCK_COUNT = 16
+
+_response_locks = [threading.Lock() for _ in range(RESPONSE_LOCK_COUNT)]
+# Guards the response cache itself, which is read and trimmed by concurrent requests
+_response_cache_lock = threading.Lock()
+
+
+def _response_lock(key):
+    """Return the lock serializing the loading of the response `key`."""
+    return _response_locks[hash(key) % RESPONSE_LOCK_COUNT]
+
+
+def _store_response(cache, key, entry):
+    """
+    Store a response entry, trimming the cache from its least recently used end.
+
+    Entries at that end are dropped while the cache is over RESPONSE_CACHE_SIZE or while
+    they can no longer be served (expired, or bound to another station handler or cache
+    version). Stale entries elsewhere are rejected by the lookup and pushed out later.
+
+    Args:
+        cache (OrderedDict): The response cache, in least recently used order.
+        key (tuple): Identifier of the response.
+        entry (tuple): The entry to store, as built by _cached_json_response.
+    """
+    now = time.monotonic()
+    with _response_cache_lock:
+        cache[key] = entry
+        cache.move_to_end(key)
+        while cache:
+            oldest = next(iter(cache.values()))
+            if len(cache) <= RESPONSE_CACHE_SIZE and oldest[0] is entry[0] and oldest[1] == entry[1] \
+                    and oldest[2] > now:
+                break
+            cache.popitem(last=False)
+
+
+def _json_bytes(data):
+    """
+    Serialize data to UTF-8 encoded JSON with the application's JSON provider.
+
+    Args:
+        data: The data to serialize.
+
+    Returns:
+        bytes: The encoded JSON document.
+    """
+    dumps_bytes = getattr(current_app.json, 'dumps_bytes', None)
+    if dumps_bytes is not None:
+        return dumps_bytes(data)
+    return current_app.json.dumps(data).encode('utf-8')
+
+
+def _cached_json_response(key, loader, allow_empty=False):
+    """
+    Return a JSON response for `key`, reusing the encoded body of a previous call.
+
+    Entries are bound to the current station handler and cache version, so they are
+    dropped as soon as the station caches are refreshed (or the handler is replaced), and
+    otherwise expire after RESPONSE_CACHE_TTL seconds (EMPTY_RESPONSE_CACHE_TTL seconds
+    for empty results). At most RESPONSE_CACHE_SIZE entries are kept.
+    Concurrent misses for the same key call the loader only once. Responses carry an ETag,
+    so conditional requests for an unchanged body are answered with 304 Not Modified.
+
+    Args:
+        key (tuple): Identifier of the response (endpoint and parameters).
+        loader (callable): Function called with the station handler, returning the data to serialize.
+        allow_empty (bool): Serialize empty results instead of returning None.
+
+    Returns:
+        Response: The JSON response, or None if the loader returned no data and `allow_empty` is False.
+    """
+    station_handler = current_app.config['STATION_HANDLER']
+    version = current_app.config.get('STATION_CACHE_VERSION', 0)
+    cache = current_app.config.setdefault('API_RESPONSE_CACHE', OrderedDict())
+
+    def lookup():
+        with _response_cache_lock:
+            entry = cache.get(key)
+            if (entry is not None and entry[0] is station_handler and entry[1] == version
+                    and time.monotonic() < entry[2]):
+                cache.move_to_end(key)
+                return entry
+        return None
+
+    entry = lookup()
+    if entry is None:
+        with _response_lock(key):
+            entry = lookup()
+            if entry is None:
+                data = loader(station_handler)
+                if data:
+                    body, ttl = _json_bytes(data), RESPONSE_CACHE_TTL
+                else:
+                    body = _json_bytes(data) if allow_empty else None
+                    ttl = EMPTY_RESPONSE_CACHE_TTL
+                etag = hashlib.blake2b(body, digest_size=16).hexdigest() if body is not None else None
+                entry = (station_handler, version, time.monotonic() + ttl, body, etag)
+                _store_response(cache, key, entry)
+
+    body, etag = entry[3], entry[4]
+    if body is None:
+        return None
+    response = current_app.response_class(body, status=200, mimetype='application/json')
+    # Clients revalidating an unchanged response get a 304 without the body
+    response.set_etag(etag)
+    response.cache_control.max_age = RESPONSE_MAX_AGE
+    return response.make_conditional(request)
+
+
+def _station_not_found(station_id):
+    """
+    Return the 404 response of a station missing from the configuration, or None if it exists.
+
+    Unknown IDs are rejected before any response is loaded or cached, so that requests for
+    arbitrary IDs neither read the cache files nor fill the response cache.
+    """
+    if current_app.config['STATION_HANDLER'].is_known_station(station_id):
+        return None
+    return jsonify({"error": "Station not found"}), 404
+
+
+def _invalid_station_type(station_type):
+    """
+    Return the 400 response of a station type missing from the configuration, or None if it exists.
+
+    Like unknown station IDs, unknown types are rejected before they become a response key.
+    """
+    if current_app.config['STATION_HANDLER'].is_known_station_type(station_type):
+        return None
+    return jsonify({"error": "Invalid station type"}), 400
+
+
 @api.route('/station/online', methods=['GET'])
 def online_stations():
-    station_handler = current_app.config['STATION_HANDLER']
     station_type = request.args.get('type', 'all')
-    stations = station_handler.get_cached_online_stations(type=station_type)
-    return jsonify(stations), 200
+    invalid = _invalid_station_type(station_type)
+    if invalid is not None:
+        return invalid
+    response = _cached_json_response(
+        ('online', station_type),
+        lambda handler: handler.get_cached_online_stations(type=station_type),
+        allow_empty=True)
+    return response
 
 @api.route('/station/offline', methods=['GET'])
 def offline_stations():
-    station_handler = current_app.config['STATION_HANDLER']
     station_type = request.args.get('type', 'all')
-    stations = station_handler.get_cached_online_stations(type=station_type, status='offline')
-    return jsonify(stations), 200
+    invalid = _invalid_station_type(station_type)
+    if invalid is not None:
+        return invalid
+    response = _cached_json_response(
+        ('offline', station_type),
+        lambda handler: handler.get_cached_online_stations(type=station_type, status='offline'),
+        allow_empty=True)
+    return response
 
 @api.route('/station/<station_id>', methods=['GET'])
 def station_metadata(station_id):
-    station_handler = current_app.config['STATION_HANDLER']
-    station = station_handler.get_cached_station_metadata(station_id)
-    if not station:
+    not_found = _station_not_found(station_id)
+    if not_found is not None:
+        return not_found
+    response = _cached_json_response(
+        ('metadata', station_id),
+        lambda handler: handler.get_cached_station_metadata(station_id))
+    if response is None:
         return jsonify({"error": "Station not found"}), 404
-    return jsonify(station), 200
+    return response
 
 @api.route('/station-data/<station_id>', methods=['GET'])
 def realtime_data(station_id):
-    station_handler = current_app.config['STATION_HANDLER']
+    not_found = _station_not_found(station_id)
+    if not_found is not None:
+        return not_found
 
     # Get the 'data' query parameter
     data_param = request.args.get('data')
 
     if data_param == 'now':
         # Fetch real-time data
-        data = station_handler.get_cached_realtime_data(station_id)
-        if not data:
+        response = _cached_json_response(
+            ('now', station_id),
+            lambda handler: handler.get_cached_realtime_data(station_id))
+        if response is None:
             return jsonify({"error": "No real-time data available"}), 404
-        return jsonify(data), 200
+        return response
 
     # Check if data_param is a valid integer (including positive and negative values)
     if data_param and data_param.lstrip('+-').isdigit():
         shift = int(data_param)
         # Fetch hourly data based on the shift value
-        data = station_handler.get_cached_hourly_data(station_id, shift)
-        if not data:
+        response = _cached_json_response(
+            ('shift', station_id, shift),
+            lambda handler: handler.get_cached_hourly_data(station_id, shift))
+        if response is None:
             return jsonify({"error": f"No data available for shift {shift}"}), 404
-        return jsonify(data), 200
+        return response
 
     # Handle cases where 'data' is not 'now' and not a valid integer
     return jsonify({"error": "Invalid request"}), 400
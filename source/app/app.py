@@ -3,17 +3,25 @@ import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
 
-from flask import Flask, send_from_directory, send_file, jsonify
+from flask import Flask, send_from_directory, send_file, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from jinja2 import TemplateNotFound
 from source.app.api import api
 from source.app.pages import pages
 
 from source.cacheHandler.cacheHandler import CacheHandler
 from source.maps_processing.sea_ice_map_processing import SeaIceCache
 from source.maps_processing.avalanche_forecast_processing import AvalancheForecastProcessing
+from source.logger.logger import Logger
 
 import threading
-import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 LIBS_FOLDER = os.path.join(PROJECT_ROOT, "libs")
@@ -22,37 +30,152 @@ MAPS_FOLDER = os.path.join(PROJECT_ROOT, "maps")
 
 PRIVATE_FILES_LIST = ['api.json']
 
+logger = Logger.setup_logger('App')
+
+# Seconds between two refreshes of the station caches and map layers
+GATHER_INTERVAL = 10 * 60
+
+PAGE_TEMPLATES = ['index.html', 'dashboard.html', 'credits.html']
+
+# Files under these folders are cached by browsers for LONG_CACHE_MAX_AGE seconds instead
+# of being revalidated on every page load. Their content is expected to be immutable:
+# ship a new file name (e.g. with the library version) when a file changes.
+LONG_CACHE_FOLDERS = (
+    LIBS_FOLDER + os.sep,
+    os.path.join(STATIC_FOLDER, "images", "data_provider_logo") + os.sep,
+)
+LONG_CACHE_MAX_AGE = 24 * 60 * 60
+# Seconds during which browsers reuse a map layer without revalidating it. The layers
+# are regenerated at most once per refresh of the data.
+MAP_LAYER_MAX_AGE = 5 * 60
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider encoding responses with orjson, which is several times faster than the
+    standard library on the large station payloads. Objects orjson does not know, and
+    dates (formatted as HTTP dates like the default provider), are handed to the default
+    Flask encoder. Keys are sorted when `sort_keys` is set, as with the default provider.
+    Calls with keyword arguments for the json module go through the default provider.
+    """
+    option = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+              if orjson else 0)
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode()
+
+    def dumps_bytes(self, obj):
+        """Serialize `obj` to UTF-8 encoded JSON, without going through a str."""
+        option = self.option | orjson.OPT_SORT_KEYS if self.sort_keys else self.option
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
+
+
+class SWIFlask(Flask):
+    """
+    Flask application serving the front-end libraries and data provider logos with a long
+    `Cache-Control: max-age`, and the map layers with a short one. Other files keep Flask's
+    default (conditional requests only).
+    """
+
+    def get_send_file_max_age(self, filename):
+        if filename:
+            path = os.path.abspath(filename)
+            if path.startswith(LONG_CACHE_FOLDERS):
+                return LONG_CACHE_MAX_AGE
+            if path.startswith(MAPS_FOLDER + os.sep):
+                return MAP_LAYER_MAX_AGE
+        return super().get_send_file_max_age(filename)
+
+
+def send_geojson(path):
+    """
+    Send a GeoJSON file, preferring its pre-compressed copy.
+
+    When the client accepts gzip and an up-to-date `<path>.gz` exists next to the file,
+    the compressed copy is sent with `Content-Encoding: gzip`. Both variants go through
+    `send_file`, which answers conditional requests (ETag / Last-Modified) with 304.
+
+    Args:
+        path (str): Path to the GeoJSON file.
+
+    Returns:
+        Response: The file response.
+    """
+    gz_path = path + ".gz"
+    if ('gzip' in request.headers.get('Accept-Encoding', '')
+            and os.path.exists(gz_path)
+            and os.path.getmtime(gz_path) >= os.path.getmtime(path)):
+        response = send_file(gz_path, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+        return response
+    return send_file(path, mimetype='application/json')
+
+
 def create_app():
-    app = Flask(__name__,
+    app = SWIFlask(__name__,
                 template_folder=os.path.join(PROJECT_ROOT, "templates"),
                 static_folder=os.path.join(PROJECT_ROOT, "static"))
     CORS(app)
 
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+
     # Initialize StationHandler once
     station_handler = CacheHandler()
     sea_ice_handler = SeaIceCache()
     avalanche_forecast_handler = AvalancheForecastProcessing()
     app.config['STATION_HANDLER'] = station_handler
+    # Incremented after each refresh of the station caches
+    app.config['STATION_CACHE_VERSION'] = 0
 
     # Use os.environ.get to provide default values if environment variables are not set
     if os.environ.get('SWI_INSTANCE_SERVE_ONLY', 'false').lower() == 'false' and os.environ.get('SWI_DOCKER_INSTANCE', 'false').lower() == 'false':
-        def gather_data():
-            while True:
+        # Set to stop the data gathering thread after its current pass
+        stop_gathering = threading.Event()
+        app.config['GATHER_STOP_EVENT'] = stop_gathering
+
+        def cache_stations():
+            # Each step relies on the station status cached by the first one
+            try:
                 station_handler.cache_stations_status()
                 station_handler.cache_realtime_data()
                 station_handler.cache_past_hourly_data()
+            finally:
+                # Release the connections and datasets of the data sources until the next pass
+                station_handler.close()
 
-                sea_ice_handler.create_ice_chart_geojson()
-                avalanche_forecast_handler.process_3003()
-
-                # Explicitly clean up the old instance
-                old_handler = app.config['STATION_HANDLER']
-                del old_handler  # Help Python garbage collect the old instance
-
-                # Replace with a fresh instance
-                app.config['STATION_HANDLER'] = CacheHandler()
-
-                time.sleep(10 * 60)  # 10 minutes
+        def gather_data():
+            # The stations and the map layers come from different upstream services, so they
+            # are refreshed concurrently: a pass takes as long as its slowest task.
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                while not stop_gathering.is_set():
+                    tasks = [executor.submit(cache_stations),
+                             executor.submit(sea_ice_handler.create_ice_chart_geojson),
+                             executor.submit(avalanche_forecast_handler.process_3003)]
+                    # A failing task is logged and retried on the next pass, without stopping the others
+                    for task in tasks:
+                        try:
+                            task.result()
+                        except Exception as e:
+                            logger.error(f"Data gathering task failed: {e}")
+
+                    # The station handler is kept (its parsed cache files are checked against
+                    # their modification time), only the API responses built before are dropped
+                    app.config['STATION_CACHE_VERSION'] += 1
+
+                    stop_gathering.wait(GATHER_INTERVAL)
 
         gathering_thread = threading.Thread(target=gather_data, daemon=True)
         gathering_thread.start()
@@ -61,6 +184,15 @@ def create_app():
     app.register_blueprint(api, url_prefix='/api')
     app.register_blueprint(pages)
 
+    # Outside of debug, templates do not change while the app runs: compile them once at
+    # startup instead of on the first request, and do not stat them again on every render.
+    app.config['TEMPLATES_AUTO_RELOAD'] = os.environ.get('FLASK_DEBUG', 'false').lower() == 'true'
+    for template in PAGE_TEMPLATES:
+        try:
+            app.jinja_env.get_template(template)
+        except TemplateNotFound:
+            pass
+
     # Serve JavaScript libraries from the libs folder
     @app.route('/libs/<path:filename>')
     def serve_libs(filename):
@@ -85,7 +217,7 @@ def create_app():
         path = os.path.join(MAPS_FOLDER, "ice_chart.geojson")
         try:
             if os.path.exists(path):
-                return send_file(path, mimetype='application/json')
+                return send_geojson(path)
             else:
                 return jsonify({"error": "GeoJSON file not found"}), 404
         except Exception as e:
@@ -97,7 +229,7 @@ def create_app():
         file_path = os.path.join(MAPS_FOLDER, f"avalanche_forecast/{filename}.geojson")
         try:
             if os.path.exists(file_path):
-                return send_file(file_path, mimetype='application/json')
+                return send_geojson(file_path)
             else:
                 return jsonify({"error": "File not found"}), 404
         except Exception as e:
@@ -109,4 +241,4 @@ def create_app():
 
 if __name__ == '__main__':
     app = create_app()
-    app.run(debug=True)
+    app.run(debug=os.environ.get('FLASK_DEBUG', 'false').lower() == 'true')
@@ -1,11 +1,11 @@
 import sys
 import os
-import subprocess
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
 
 
 from flask import Blueprint, render_template, current_app, url_for
+from functools import lru_cache
 import os
 import json
 from utils.citation_utils import load_references
@@ -15,6 +15,27 @@ pages = Blueprint('pages', __name__)
 def get_version_info():
     """Retrieve and format the version information from the version file."""
     version_file_path = './version'
+    try:
+        mtime = os.path.getmtime(version_file_path)
+    except OSError:
+        return "unknown"
+    return _read_version_info(version_file_path, mtime)
+
+@lru_cache(maxsize=4)
+def _read_version_info(version_file_path, mtime):
+    """
+    Read and format the version file.
+
+    The result is memoized and only read again when the modification time of the file
+    changes, instead of opening the file on every page request.
+
+    Args:
+        version_file_path (str): Path to the version file.
+        mtime (float): Modification time of the version file.
+
+    Returns:
+        str: The formatted version information.
+    """
     try:
         with open(version_file_path, 'r') as file:
             lines = file.readlines()
@@ -51,14 +72,55 @@ def credits():
     Includes a landscape image and provider logos in place of the map, with links.
     """
     version_info = get_version_info()
-    # Load references
-    references = load_references()
 
-    # Path to data provider logo directory and link file
+    # Path to data provider logo directory
     logo_dir = os.path.join(current_app.static_folder, "images/data_provider_logo")
-    link_file = os.path.join(logo_dir, "link.json")
+    references, logo_files = _load_credits(logo_dir, *_credits_mtimes(logo_dir))
+
+    logos = [
+        {
+            "src": url_for('static', filename=f'images/data_provider_logo/{file}'),
+            "link": link
+        }
+        for file, link in logo_files
+    ]
+
+    # Render the template
+    return render_template('credits.html', references=references, logos=logos, version_info=version_info)
+
+
+def _credits_mtimes(logo_dir):
+    """Return the modification times of the logo directory and its link file (None if missing)."""
+    mtimes = []
+    for path in (logo_dir, os.path.join(logo_dir, "link.json")):
+        try:
+            mtimes.append(os.path.getmtime(path))
+        except OSError:
+            mtimes.append(None)
+    return mtimes
+
+
+@lru_cache(maxsize=4)
+def _load_credits(logo_dir, logo_dir_mtime, link_file_mtime):
+    """
+    Load the references and the data provider logos shown on the credits page.
+
+    The result is memoized and only rebuilt when the modification time of the logo
+    directory or of its link file changes.
+
+    Args:
+        logo_dir (str): Path to the data provider logo directory.
+        logo_dir_mtime (float): Modification time of the logo directory.
+        link_file_mtime (float): Modification time of `link.json`.
+
+    Returns:
+        tuple: The references and a tuple of (logo file name, link) pairs.
+    """
+    # Load references
+    references = load_references()
 
     # Load links from link.json
+    link_file = os.path.join(logo_dir, "link.json")
     try:
         with open(link_file, 'r') as f:
             logo_links = json.load(f)
@@ -66,14 +128,9 @@ def credits():
         logo_links = {}
 
     # Dynamically fetch logos and their links
-    logos = [
-        {
-            "src": url_for('static', filename=f'images/data_provider_logo/{file}'),
-            "link": logo_links.get(file, "#")  # Default to '#' if no link is found
-        }
+    logo_files = tuple(
+        (file, logo_links.get(file, "#"))  # Default to '#' if no link is found
         for file in os.listdir(logo_dir)
         if file.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.svg'))
-    ]
-
-    # Render the template
-    return render_template('credits.html', references=references, logos=logos, version_info=version_info)
+    )
+    return references, logo_files
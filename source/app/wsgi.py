@@ -0,0 +1,9 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from source.app.app import create_app
+
+# WSGI entry point, e.g. `gunicorn --preload -w 4 --threads 8 source.app.wsgi:app`
+app = create_app()
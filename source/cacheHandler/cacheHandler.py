@@ -575,11 +575,24 @@ from source.logger.logger import Logger
 
 import json
 from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
 import shutil
+import threading
 import pandas as pd
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Options of the cache files written with orjson: the station results are keyed by
+# strings but may hold numpy values, which the standard library cannot serialize.
+# The files are only read by the application, so they are written compact unless a
+# handler is created with pretty=True.
+ORJSON_CACHE_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+
 class CacheHandler:
-    def __init__(self, directory='./data/', path_config = None, cleaning_list = None):
+    def __init__(self, directory='./data/', path_config = None, cleaning_list = None, max_workers = 8, pretty = False):
         """
             Initialize a CacheHandler instance to manage caching of station data.
 
@@ -598,6 +611,10 @@ class CacheHandler:
                         }
                 cleaning_list (list, optional): A list of cache entry keys to be cleared during cache operations.
                     Default is ['online', 'offline'].
+                max_workers (int, optional): Number of stations fetched concurrently from the upstream APIs.
+                    Default is 8.
+                pretty (bool, optional): Indent the cache files, e.g. to read them while debugging.
+                    Default is False (compact files).
 
             Returns:
                 None
@@ -606,6 +623,11 @@ class CacheHandler:
         self.logger = Logger.setup_logger("CacheHandler")
         self.config = ConfigHandler()
         self.online_stations = []
+        self.max_workers = max_workers
+        self.pretty = pretty
+        # Data source of each station, shared by the caching steps until `close` is called
+        self._datasources = {}
+        self._datasources_lock = threading.Lock()
 
         os.makedirs(self.directory, exist_ok=True)
 
@@ -651,21 +673,18 @@ class CacheHandler:
         state = {}
         online = {}
         offline = {}
-        
+        # All the stations of the batch share the time it was started at
+        timestamp = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
 
-        for station_id in stations:
+        def fetch_status(station_id):
             try:
                 self.logger.debug(f"Processing station status for: {station_id}")
-                datasource = get_datasource(station_id,  config=self.config)
+                datasource = self._get_datasource(station_id)
                 is_online = datasource.is_station_online(station_id)
                 self.logger.debug(f"Station {station_id} online status: {'online' if is_online else 'offline'}")
 
-                if is_online:
-                    self.online_stations.append(station_id)
-
                 metadata = self.config.get_metadata(station_id) or {}
                 variables = self.config.get_variable(station_id)
-                timestamp = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
 
                 infos = {
                     "id": station_id,
@@ -682,16 +701,23 @@ class CacheHandler:
                     "icon" : metadata.get("icon", "/static/images/red_dot.png"),
                 }
 
-                state[station_id] = infos
-                if is_online:
-                    online[station_id] = infos
-                else:
-                    offline[station_id] = infos
-
                 self.logger.info(f"Successfully processed station {station_id}")
+                return infos
 
             except Exception as e:
                 self.logger.error(f"Error processing station {station_id}: {e}", exc_info=True)
+                return None
+
+        # The stations are checked concurrently, the results are gathered in the station order
+        for station_id, infos in zip(stations, self._map_stations(fetch_status, stations)):
+            if infos is None:
+                continue
+            state[station_id] = infos
+            if infos["status"] == "online":
+                self.online_stations.append(station_id)
+                online[station_id] = infos
+            else:
+                offline[station_id] = infos
 
         self.logger.info(f"Finished caching station statuses. Total stations processed: {len(state)}")
 
@@ -730,23 +756,45 @@ class CacheHandler:
             self.logger.warning("No online stations found. Skipping data caching.")
             return
 
-        latest_station_data = {}
-
-        for station in self.online_stations:
+        def fetch(station):
             try:
                 self.logger.debug(f"Fetching real-time data for station: {station}")
-                datasource = get_datasource(station,  config=self.config)
-
-                data = datasource.fetch_realtime_data(station)
-
-                if not data:
-                    self.logger.warning(f"No data fetched for {station}, skipping cache write.")
-                    continue
+                return datasources[station].fetch_realtime_data(station)
 
-                latest_station_data[station] = data
+            except Exception as e:
+                self.logger.error(f"Error processing real-time data for {station}: {e}", exc_info=True)
+                return None
 
+        # Stations of data sources able to batch their requests are fetched with one call per data source
+        datasources = {}
+        batches = {}
+        for station in self.online_stations:
+            try:
+                datasource = self._get_datasource(station)
             except Exception as e:
                 self.logger.error(f"Error processing real-time data for {station}: {e}", exc_info=True)
+                continue
+            if getattr(type(datasource), "BATCH_REALTIME", False) is True:
+                batches.setdefault(type(datasource), (datasource, []))[1].append(station)
+            else:
+                datasources[station] = datasource
+
+        results = {}
+        for datasource, stations in batches.values():
+            try:
+                results.update(datasource.fetch_realtime_data_batch(stations))
+            except Exception as e:
+                self.logger.error(f"Error processing real-time data for {stations}: {e}", exc_info=True)
+
+        stations = list(datasources)
+        results.update(zip(stations, self._map_stations(fetch, stations)))
+
+        latest_station_data = {}
+        for station in self.online_stations:
+            if results.get(station):
+                latest_station_data[station] = results[station]
+            else:
+                self.logger.warning(f"No data fetched for {station}, skipping cache write.")
 
         self._write_cache(latest_station_data, os.path.join(self.path_config.get('realtime_data'), "latest_dict.json"))
 
@@ -768,8 +816,6 @@ class CacheHandler:
         """
         self.logger.info("Starting to cache hourly data...")
 
-        hourly_data_path = self.path_config.get('hourly_data', '/hourly_data/')
-
         if self.online_stations is None or len(self.online_stations) == 0:
             self.logger.info("Unknown station status. Starting collection and caching of the station status...")
             self.cache_stations_status()
@@ -784,11 +830,13 @@ class CacheHandler:
         start_of_day = end_time.replace(hour=0, minute=0, second=0, microsecond=0)
 
         result = {-i : {} for i in range(1, hours_ago+1)}
+        # Hour (as a "YYYY-MM-DDTHH" prefix) of each shift, shared by all the stations
+        shift_hours = {shift: (end_time - timedelta(hours=shift)).isoformat()[:13] for shift in range(1, hours_ago + 1)}
 
-        for station in self.online_stations:
+        def fetch_hourly(station):
             try:
                 self.logger.debug(f"Fetching hourly data for station: {station}")
-                datasource = get_datasource(station, config=self.config)
+                datasource = self._get_datasource(station)
 
 
                 # print(datetime.utcnow().isoformat(),(start_time - timedelta(hours=12)).isoformat(), type((start_time - timedelta(hours=12)).isoformat()))
@@ -799,11 +847,22 @@ class CacheHandler:
                     return_df=True
                 )
 
+                if data is None or data.empty:
+                    self.logger.warning(f"No data fetched for {station}, skipping cache write.")
+                    return None
+
+                # The windows are located on the sorted index with binary searches instead of boolean masks
+                if not data.index.is_monotonic_increasing:
+                    data = data.sort_index()
+                last = data.index.searchsorted(pd.to_datetime(end_time), side="right")
+                first_of_day = data.index.searchsorted(pd.to_datetime(start_of_day), side="left")
+                first = data.index.searchsorted(pd.to_datetime(start_time), side="left")
+
                 path_parquet = os.path.join(self.path_config.get("historical", "./000_long_timeseries/"), station, f"{end_time.strftime("%Y-%m-%d")}.parquet")
-                self._atomic_write_parquet(data[(data.index <= pd.to_datetime(end_time)) & (data.index >= pd.to_datetime(start_of_day))], path_parquet)
+                self._atomic_write_parquet(data.iloc[first_of_day:last], path_parquet)
 
 
-                data = datasource.df_to_timeserie(data[(data.index <= pd.to_datetime(end_time)) & (data.index >= pd.to_datetime(start_time))])
+                data = datasource.df_to_timeserie(data.iloc[first:last])
 
                 data = {
                 "id": station,
@@ -813,34 +872,44 @@ class CacheHandler:
 
                 if not data or 'timeseries' not in data:
                     self.logger.warning(f"No data fetched for {station}, skipping cache write.")
-                    continue
+                    return None
 
-                # Create a subdirectory for each hourly shift
-                for shift in range(1, hours_ago + 1):
-                    shift_time = end_time - timedelta(hours=shift)
-                    shift_path = os.path.join(hourly_data_path, f"-{shift}")
-                    
+                # Entries indexed by hour (the first one of each hour), so each shift is a lookup
+                # instead of a scan of the time series
+                by_hour = {}
+                for e in data['timeseries']:
+                    by_hour.setdefault(e['timestamp'][:13], e)
+
+                shifts = {}
+                for shift, hour in shift_hours.items():
                     # Find the corresponding data entry for the shift
-                    entry = next((e for e in data['timeseries'] if e['timestamp'].startswith(shift_time.isoformat()[:13])), None)
+                    entry = by_hour.get(hour)
                     if entry:
                         # Prepare the data structure with a single record in timeseries
                         data_to_cache = {
                             "id": station,
                             "timeseries": [entry]
                         }
-                        result[-shift][station] = data_to_cache
+                        shifts[-shift] = data_to_cache
                     else:
                         data_to_cache = {
                             "id": station,
                             "timeseries": None
                         }
-                        result[-shift][station] = data_to_cache
+                        shifts[-shift] = data_to_cache
                         self.logger.warning(f"No data entry found for {station} at shift {shift}.")
+                return shifts
 
             except Exception as e:
-                raise e
+                # A failing station must not prevent the hourly files of the others from being written
                 self.logger.error(f"Error processing hourly data for {station}: {e}", exc_info=True)
+                return None
 
+        # The stations are fetched concurrently, the results are gathered in the station order
+        stations = list(self.online_stations)
+        for station, shifts in zip(stations, self._map_stations(fetch_hourly, stations)):
+            for shift, data_to_cache in (shifts or {}).items():
+                result[shift][station] = data_to_cache
 
         for key, value in result.items():
             path = os.path.join(self.path_config.get('hourly_data', './000_hourly_data/'), f"{key}.json")
@@ -848,6 +917,90 @@ class CacheHandler:
 
         self.logger.info("Finished caching hourly data.")
 
+    def is_known_station(self, station_id):
+        """
+        Check whether a station is defined in the station configuration.
+
+        The lookup goes through the configuration index, so requests for unknown stations
+        can be rejected before any cache file is read.
+
+        Args:
+            station_id (str): The ID of the station.
+
+        Returns:
+            bool: True if the station is configured, False otherwise.
+        """
+        return bool(station_id) and self.config.get_metadata(station_id) is not None
+
+    def is_known_station_type(self, station_type):
+        """
+        Check whether a station type is "all" or the type of a configured station.
+
+        Args:
+            station_type (str): The station type, as used to filter the online and offline stations.
+
+        Returns:
+            bool: True if the type is "all" or used by a configured station, False otherwise.
+        """
+        return station_type == "all" or station_type in self.config.get_station_types()
+
+    def close(self):
+        """
+        Release the connections and datasets held by the data sources used since the last call.
+
+        The data sources are created again on their next use, so that changes of the station
+        configuration are picked up between caching passes.
+        """
+        with self._datasources_lock:
+            datasources = list(self._datasources.values())
+            self._datasources.clear()
+        for datasource in datasources:
+            try:
+                datasource.close()
+            except Exception as e:
+                self.logger.error(f"Error closing data source {type(datasource).__name__}: {e}")
+
+    def _get_datasource(self, station_id):
+        """
+        Return the data source of a station, creating it on first use.
+
+        The instance is reused by the status, real-time and hourly caching steps, which then
+        share its HTTP connections and opened datasets instead of each building a new one.
+
+        Args:
+            station_id (str): The ID of the station.
+
+        Returns:
+            DataSource: The data source of the station.
+        """
+        with self._datasources_lock:
+            datasource = self._datasources.get(station_id)
+        if datasource is None:
+            datasource = get_datasource(station_id, config=self.config)
+            with self._datasources_lock:
+                datasource = self._datasources.setdefault(station_id, datasource)
+        return datasource
+
+    def _map_stations(self, func, stations):
+        """
+        Apply a function to every station, overlapping the upstream requests in a thread pool.
+
+        The work done per station is dominated by waiting on remote APIs, so running the stations
+        concurrently shortens a caching pass to roughly the time of the slowest stations.
+
+        Args:
+            func (callable): Function called with a station ID. It should handle its own errors.
+            stations (list): List of station IDs.
+
+        Returns:
+            list: The results of `func`, in the same order as `stations`.
+        """
+        if self.max_workers <= 1 or len(stations) <= 1:
+            return [func(station) for station in stations]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(stations))) as executor:
+            return list(executor.map(func, stations))
+
     def _clear_cache(self, entries):
         """
         Clear specified cache entries by deleting their corresponding files or directories.
@@ -911,8 +1064,16 @@ class CacheHandler:
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
         try:
-            with open(file_path + ".tmp", 'w', encoding='utf-8') as file:
-                json.dump(json_data, file, indent=4)
+            if orjson is not None:
+                option = ORJSON_CACHE_OPTIONS | orjson.OPT_INDENT_2 if self.pretty else ORJSON_CACHE_OPTIONS
+                with open(file_path + ".tmp", 'wb') as file:
+                    file.write(orjson.dumps(json_data, option=option))
+            else:
+                with open(file_path + ".tmp", 'w', encoding='utf-8') as file:
+                    if self.pretty:
+                        json.dump(json_data, file, indent=4)
+                    else:
+                        json.dump(json_data, file, separators=(',', ':'))
             os.replace(file_path + ".tmp", file_path)
             self.logger.info(f"Cache written successfully to {file_path}")
         except Exception as e:
@@ -935,10 +1096,14 @@ class CacheHandler:
         """
         file_path = os.path.join(self.directory, struct)
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-                self.logger.info(f"Cache read successfully from {file_path}")
-                return data
+            if orjson is not None:
+                with open(file_path, 'rb') as file:
+                    data = orjson.loads(file.read())
+            else:
+                with open(file_path, 'r', encoding='utf-8') as file:
+                    data = json.load(file)
+            self.logger.info(f"Cache read successfully from {file_path}")
+            return data
         except FileNotFoundError:
             self.logger.warning(f"Cache file {file_path} not found.")
             return None
@@ -5,12 +5,29 @@ import json
 from source.logger.logger import Logger
 import difflib
 import os
+import threading
+import time
 
 config_files = [
     'config/stations/fixed_stations.json',
     'config/stations/mobile_stations.json'
 ]
 
+# Parsed configuration files shared by every ConfigHandler of the process,
+# keyed by file path and holding (mtime, list of station configs).
+_parsed_files = {}
+_parsed_files_lock = threading.Lock()
+
+# Seconds during which a ConfigHandler reuses its loaded configuration without checking
+# the files' modification times, so station lookups on the request path make no system call.
+CONFIG_CHECK_INTERVAL = 30
+
+# Last combined configuration, its index by station ID and its set of station types. They
+# are rebuilt only when one of the parsed files changes, so station lookups are dictionary
+# accesses and type checks are set lookups.
+_combined_configs = {"parts": None, "configs": None}
+_station_index = {"configs": None, "index": None, "types": None}
+
 class StationNotFoundError(Exception):
     """
     Exception raised when a station is not found in the configuration files.
@@ -30,7 +47,7 @@ class ConfigHandler:
 
     Attributes:
         config_files (list): List of file paths to configuration JSON files.
-        _cached_configs (list or None): Cached configuration data, loaded once and reused.
+        _cached_configs (list or None): Configuration data last loaded by this instance.
         logger (logging.Logger): Logger instance for logging actions and errors.
     """
 
@@ -40,6 +57,7 @@ class ConfigHandler:
         """
         self.config_files = config_files
         self._cached_configs = None
+        self._configs_checked_at = None
         self._cached_credential = None
         self.logger = Logger.setup_logger(self.__class__.__name__)
 
@@ -60,9 +78,9 @@ class ConfigHandler:
             raise ValueError("station_id must be provided")
 
         configs = self._load_config()
-        for config in configs:
-            if config.get("id") == station_id:
-                return config.get("variables", None)
+        config = self._index_configs(configs).get(station_id)
+        if config is not None:
+            return config.get("variables", None)
 
         suggestions = difflib.get_close_matches(
             station_id,
@@ -87,13 +105,7 @@ class ConfigHandler:
             raise ValueError("station_id must be provided")
 
         configs = self._load_config()
-        for config in configs:
-            if config.get("id") == station_id:
-                if "datasource" not in config:
-                    #config["datasource"] = "FrostDatasource"
-                    pass
-                return config
-        return None
+        return self._index_configs(configs).get(station_id)
 
     def get_stations(self, type="all"):
         """
@@ -121,6 +133,15 @@ class ConfigHandler:
                 stations.append(config.get("id"))
         return stations
 
+    def get_station_types(self):
+        """
+        Get the types of the configured stations.
+
+        Returns:
+            frozenset: Types used by at least one configured station (e.g. "fixed", "mobile").
+        """
+        return self._index_configs_and_types(self._load_config())[1]
+
     def _load_config(self):
         """
         Load configurations from a list of JSON files.
@@ -133,37 +154,128 @@ class ConfigHandler:
             list: A combined list of configuration dictionaries from all files.
 
         Notes:
-            - Caches the configuration data to avoid repeated file I/O.
+            - The loaded configuration is reused for CONFIG_CHECK_INTERVAL seconds.
+              Parsed files are shared between instances and only re-read when
+              their modification time changes.
             - Logs and handles errors such as missing files or invalid JSON.
 
         Raises:
             FileNotFoundError: If a configuration file is not found.
             json.JSONDecodeError: If a configuration file contains invalid JSON.
         """
-        if self._cached_configs is not None:
+        now = time.monotonic()
+        if self._cached_configs is not None and now - self._configs_checked_at < CONFIG_CHECK_INTERVAL:
             return self._cached_configs
 
-        configs = []
+        parts = []
         for file in self.config_files:
             try:
-                with open(file, 'r') as f:
-                    data = json.load(f)
-                    # Ensure we have a list of config dictionaries
-                    config_list = data if isinstance(data, list) else [data]
-                    for config in config_list:
-                        # Add station type: if the config contains the key 'mobile',
-                        # mark it as 'mobile', otherwise default to 'fixed'
-                        if 'mobile' in file:
-                            config['type'] = 'mobile'
-                        else:
-                            config['type'] = 'fixed'
-                    configs.extend(config_list)
+                parts.append(self._load_config_file(file))
             except (FileNotFoundError, json.JSONDecodeError) as e:
                 self._handle_error(e)
 
+        with _parsed_files_lock:
+            previous = _combined_configs["parts"]
+            if previous is not None and len(previous) == len(parts) \
+                    and all(old is new for old, new in zip(previous, parts)):
+                configs = _combined_configs["configs"]
+            else:
+                configs = [config for part in parts for config in part]
+                _combined_configs.update(parts=parts, configs=configs)
+
         self._cached_configs = configs
+        self._configs_checked_at = now
         return configs
+
+    @staticmethod
+    def _index_configs(configs):
+        """
+        Index station configurations by station ID.
+
+        The index of the last configuration list is kept, so repeated lookups on an
+        unchanged configuration do not scan the list again.
+
+        Args:
+            configs (list): Configuration dictionaries, as returned by `_load_config`.
+
+        Returns:
+            dict: Configuration dictionaries keyed by station ID. When an ID is defined
+                  several times, the first definition is kept.
+        """
+        return ConfigHandler._index_configs_and_types(configs)[0]
+
+    @staticmethod
+    def _index_configs_and_types(configs):
+        """
+        Index station configurations by station ID and collect their station types.
+
+        Both are kept for the last configuration list, so repeated calls on an unchanged
+        configuration do not scan the list again.
+
+        Args:
+            configs (list): Configuration dictionaries, as returned by `_load_config`.
+
+        Returns:
+            tuple: The index (dict) of `_index_configs` and the station types (frozenset).
+        """
+        with _parsed_files_lock:
+            if _station_index["configs"] is configs:
+                return _station_index["index"], _station_index["types"]
+
+        index = {}
+        for config in configs:
+            index.setdefault(config.get("id"), config)
+        types = frozenset(config.get("type") for config in configs if config.get("type"))
+
+        with _parsed_files_lock:
+            _station_index.update(configs=configs, index=index, types=types)
+        return index, types
     
+    def _load_config_file(self, file):
+        """
+        Load the station configurations of a single JSON file.
+
+        The parsed content is kept in a process-wide cache keyed by path and
+        reused as long as the file's modification time is unchanged.
+
+        Args:
+            file (str): Path to the configuration file.
+
+        Returns:
+            list: Configuration dictionaries defined in the file.
+
+        Raises:
+            FileNotFoundError: If the configuration file is not found.
+            json.JSONDecodeError: If the configuration file contains invalid JSON.
+        """
+        try:
+            mtime = os.path.getmtime(file)
+        except OSError:
+            mtime = None
+
+        if mtime is not None:
+            with _parsed_files_lock:
+                cached = _parsed_files.get(file)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+
+        with open(file, 'r') as f:
+            data = json.load(f)
+        # Ensure we have a list of config dictionaries
+        config_list = data if isinstance(data, list) else [data]
+        for config in config_list:
+            # Add station type: if the config contains the key 'mobile',
+            # mark it as 'mobile', otherwise default to 'fixed'
+            if 'mobile' in file:
+                config['type'] = 'mobile'
+            else:
+                config['type'] = 'fixed'
+
+        if mtime is not None:
+            with _parsed_files_lock:
+                _parsed_files[file] = (mtime, config_list)
+        return config_list
+
     def _handle_error(self, error):
         """
         Log and handle errors that occur during configuration loading or data fetching.
@@ -32,8 +32,7 @@ class FrostBoatSource(DataSource):
             client_id (str): The client ID for authenticating with the Frost API.
         """
         super().__init__(api_key = os.getenv("SWI_FROST_API_KEY", api_key))
-        self.session = requests.Session()
-        self.session.auth = (self.api_key, '')
+        self.session = self._create_session(auth=(self.api_key, ''))
 
     def fetch_station_data(self, station_id):
         """
@@ -150,6 +149,7 @@ class FrostBoatSource(DataSource):
         try:
             # Fetch variable mapping for the station
             variable_mapping = self.config.get_variable(station_id)
+            element_lookup = self._element_lookup(variable_mapping)
             observations = raw_data.get('data', [])
             timeseries = []
 
@@ -158,7 +158,7 @@ class FrostBoatSource(DataSource):
                 record = {"timestamp": source.get('referenceTime')}
                 for obs in source.get('observations', []):
                     element_id = obs.get('elementId')
-                    variable_name = next((k for k, v in variable_mapping.items() if v == element_id), None)
+                    variable_name = element_lookup.get(element_id)
 
                     if element_id == 'latitude':
                         record['latitude'] = obs.get('value')
@@ -215,6 +215,7 @@ class FrostBoatSource(DataSource):
         """
         try:
             variable_mapping = self.config.get_variable(station_id)
+            element_lookup = self._element_lookup(variable_mapping)
             sources = raw_data.get('data', [])
 
             latest_observations = {}
@@ -235,7 +236,7 @@ class FrostBoatSource(DataSource):
                         if element_id == 'longitude':
                             long = value
 
-                        var = next((k for k, v in variable_mapping.items() if v == element_id), None)
+                        var = element_lookup.get(element_id)
 
                         if var is not None:
                             observation[var] = value
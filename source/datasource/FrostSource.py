@@ -20,6 +20,7 @@ class FrostSource(DataSource):
     """
 
     BASE_URL = "https://frost.met.no"
+    BATCH_REALTIME = True
 
     def __init__(self, api_key = None):
         """
@@ -29,8 +30,7 @@ class FrostSource(DataSource):
             client_id (str): The client ID for authenticating with the Frost API.
         """
         super().__init__(api_key = os.getenv("SWI_FROST_API_KEY", api_key))
-        self.session = requests.Session()
-        self.session.auth = (self.api_key, '')
+        self.session = self._create_session(auth=(self.api_key, ''))
 
     def fetch_station_data(self, station_id):
         """
@@ -92,6 +92,55 @@ class FrostSource(DataSource):
             self._handle_error(e)
             return None
 
+    def fetch_realtime_data_batch(self, station_ids):
+        """
+        Retrieve real-time weather data for several stations with a single request.
+
+        The observations endpoint accepts a list of sources, so the latest observations of all
+        the stations are requested at once and split by source afterwards. If the combined
+        request fails, the stations are fetched one by one.
+
+        Args:
+            station_ids (list): The IDs of the weather stations.
+
+        Returns:
+            dict: Transformed real-time data of each station (None if unavailable), keyed by station ID.
+        """
+        endpoint = f"{self.BASE_URL}/observations/v0.jsonld"
+
+        variables = []
+        for station_id in station_ids:
+            for element_id in (self.config.get_variable(station_id) or {}).values():
+                if element_id is not None and element_id not in variables:
+                    variables.append(element_id)
+
+        params = {
+            "sources": ",".join(station_ids),
+            "elements": ",".join(variables),
+            "referencetime": "latest",
+        }
+
+        try:
+            response = self.session.get(endpoint, params=params)
+            response.raise_for_status()
+            raw_data = response.json()
+        except requests.exceptions.RequestException as e:
+            self.logger.warning(f"Combined real-time request failed, fetching stations one by one: {e}")
+            return super().fetch_realtime_data_batch(station_ids)
+
+        # Source IDs of the observations are suffixed with the sensor number, e.g. "SN18700:0"
+        sources = {station_id: [] for station_id in station_ids}
+        for source in raw_data.get('data', []):
+            station_id = source.get('sourceId', '').split(':')[0]
+            if station_id in sources:
+                sources[station_id].append(source)
+
+        self.logger.info(f"Fetched real-time data for {len(station_ids)} stations")
+        return {
+            station_id: self.transform_realtime_data({'data': data}, station_id)
+            for station_id, data in sources.items()
+        }
+
     def fetch_timeseries_data(self, station_id, start_time, end_time, return_df = False):
         """
         Query historical weather data for a specific time range.
@@ -147,21 +196,26 @@ class FrostSource(DataSource):
         try:
             # Fetch variable mapping for the station
             variable_mapping = self.config.get_variable(station_id)
+            element_lookup = self._element_lookup(variable_mapping)
             observations = raw_data.get('data', [])
-            timeseries = []
 
+            # One record per timestamp: Frost returns one entry per sensor of the station, so the
+            # entries sharing a reference time are merged through a dictionary keyed on that time.
+            # The first value of each variable is kept.
+            records = {}
             for source in observations:
-                # Initialize a dictionary for each timestamp
-                record = {"timestamp": source.get('referenceTime')}
+                reference_time = source.get('referenceTime')
+                record = records.get(reference_time)
                 for obs in source.get('observations', []):
                     element_id = obs.get('elementId')
-                    variable_name = next((k for k, v in variable_mapping.items() if v == element_id), None)
+                    variable_name = element_lookup.get(element_id)
                     if variable_name:
-                        record[variable_name] = obs.get('value')
-                        timeseries.append(record)
+                        if record is None:
+                            record = records[reference_time] = {"timestamp": reference_time}
+                        record.setdefault(variable_name, obs.get('value'))
 
             # Create DataFrame from the timeseries data
-            df = pd.DataFrame(timeseries)
+            df = pd.DataFrame(list(records.values()))
 
             # Ensure 'timestamp' is parsed as datetime
             if not df.empty:
@@ -201,6 +255,7 @@ class FrostSource(DataSource):
         """
         try:
             variable_mapping = self.config.get_variable(station_id)
+            element_lookup = self._element_lookup(variable_mapping)
             sources = raw_data.get('data', [])
 
             # Dictionary to store the latest observation for each variable
@@ -219,7 +274,7 @@ class FrostSource(DataSource):
                 for obs in source.get('observations', []):
                     element_id = obs.get('elementId')
                     value = obs.get('value')
-                    var = next((k for k, v in variable_mapping.items() if v == element_id), None)
+                    var = element_lookup.get(element_id)
 
                     if var is not None:
                         # Store the observation if it's the latest for the variable
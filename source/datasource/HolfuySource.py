@@ -2,7 +2,6 @@
 # SPDX-License-Identifier:  EUPL-1.2
 
 import requests
-from datetime import datetime, timedelta, timezone
 import pandas as pd
 import numpy as np
 import os
@@ -29,7 +28,7 @@ class HolfuySource(DataSource):
             client_id (str): The client ID for authenticating with the Frost API.
         """
         super().__init__(api_key=os.getenv("SWI_HOLFUY_API_KEY", api_key))
-        self.session = requests.Session()
+        self.session = self._create_session()
 
     def fetch_station_data(self, station_id):
         """
@@ -127,34 +126,27 @@ class HolfuySource(DataSource):
             # Fetch variable mapping for the station
             variable_mapping = self.config.get_variable(station_id)
             
-            timeseries = []
-
-            for m in raw_data.get("measurements", []):
-                ts = {}
-
-                if m["dateTime"]:
-                    ts["timestamp"] = pd.to_datetime(m["dateTime"]).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
-                else:
-                    raise("No TimeStamp found in the API Answer")
+            # Flatten the measurements into columns at once, nested values become e.g. 'wind_speed'
+            measurements = pd.json_normalize(raw_data.get("measurements", []), sep="_")
 
+            df = pd.DataFrame()
+            if not measurements.empty:
+                if "dateTime" not in measurements or not measurements["dateTime"].all():
+                    raise ValueError("No TimeStamp found in the API Answer")
 
+                df = pd.DataFrame({"timestamp": measurements["dateTime"]})
                 for key, value in variable_mapping.items():
-                    if m.get(value):
-                        ts[key] = float(m[value])
-                    elif m.get(value.split("_")[0]) and m.get(value.split("_")[0]).get(value.split("_")[1]):
-                        ts[key] = float(m[value.split("_")[0]][value.split("_")[1]])
+                    if value in measurements:
+                        df[key] = pd.to_numeric(measurements[value], errors="coerce")
                     else:
-                        ts[key] = np.nan
-
-                timeseries.append(ts)
-
-
-            # Create DataFrame from the timeseries data
-            df = pd.DataFrame(timeseries)
+                        df[key] = np.nan
 
-            # Ensure 'timestamp' is parsed as datetime
+            # Parse the timestamps in one call, the archive is requested in UTC
             if not df.empty:
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
+                timestamps = pd.to_datetime(df['timestamp'])
+                if timestamps.dt.tz is not None:
+                    timestamps = timestamps.dt.tz_localize(None)
+                df['timestamp'] = timestamps.dt.tz_localize('UTC')
                 df.set_index('timestamp', inplace=True)
 
             # print(type(start_time), end_time, df)
@@ -211,10 +203,13 @@ class HolfuySource(DataSource):
                 raise("No TimeStamp found in the API Answer")
 
             for key, value in variable_mapping.items():
+                # Nested values are mapped as e.g. 'wind_speed' for {"wind": {"speed": ...}}
+                group, _, field = value.partition("_")
+                nested = raw_data.get(group)
                 if raw_data.get(value):
                     ts[key] = raw_data[value]
-                elif raw_data.get(value.split("_")[0]) and raw_data.get(value.split("_")[0]).get(value.split("_")[1]):
-                    ts[key] = raw_data[value.split("_")[0]][value.split("_")[1]]
+                elif isinstance(nested, dict) and nested.get(field):
+                    ts[key] = nested[field]
                 else:
                     ts[key] = None
 
@@ -1,16 +1,32 @@
 # SPDX-FileCopyrightText: 2025 Louis Pauchet <louis.pauchet@insa-rouen.fr>
 # SPDX-License-Identifier:  EUPL-1.2
 
-from datetime import datetime, timedelta, date
+from datetime import timedelta, date
+from collections import OrderedDict
+import threading
+import time
 import pandas as pd
-import netCDF4 as nc
 
 from .datasource import DataSource
 
+# netCDF4 is imported inside the methods that read datasets: it is slow to load and
+# most processes importing the datasource factory never touch an IWIN station.
+
+# Opened datasets are reused for this many seconds. A handle does not see records
+# appended to the file after it was opened, so it must not be kept for long.
+DATASET_CACHE_TTL = 120
+# Maximum number of datasets kept open by a source.
+DATASET_CACHE_SIZE = 4
+# HDF5 chunk cache of each variable of local datasets, so that the repeated reads of the
+# same variables on a cached handle are served from memory.
+VARIABLE_CHUNK_CACHE = dict(size=16 * 1024 * 1024, nelems=4099, preemption=0.75)
+
 
 class IWINFixedSource(DataSource):
     def __init__(self, api_key=None):
         super().__init__(api_key=api_key)
+        self._datasets = OrderedDict()
+        self._datasets_lock = threading.Lock()
 
     def fetch_station_data(self, station_id):
         """
@@ -54,6 +70,8 @@ class IWINFixedSource(DataSource):
             FileNotFoundError: If today's dataset is not available.
             ValueError: If no valid data or variable mappings are found.
         """
+        import netCDF4 as nc
+
         try:
             dataset = self._load_file(station_id, old=0)
         except FileNotFoundError as e:
@@ -67,9 +85,8 @@ class IWINFixedSource(DataSource):
 
         try:
             time_var = dataset.variables["time"]
-            times = nc.num2date(time_var[:], time_var.units)
-            most_recent_index = len(times) - 1
-            most_recent_timestamp = times[most_recent_index]
+            # Only the last time value is decoded
+            most_recent_timestamp = nc.num2date(time_var[-1:][-1], time_var.units)
             self.logger.debug(f"Most recent timestamp for {station_id}: {most_recent_timestamp}")
         except KeyError:
             raise ValueError(f"Time variable not found in dataset for station {station_id}.")
@@ -82,7 +99,7 @@ class IWINFixedSource(DataSource):
             if mapped_var and mapped_var in dataset.variables:
                 try:
                     # Handle scalar values or numpy arrays
-                    value = dataset.variables[mapped_var][most_recent_index]
+                    value = dataset.variables[mapped_var][-1]
                     raw_data[raw_var] = value.item() if hasattr(value, "item") else value
                 except Exception as e:
                     self.logger.warning(f"Error fetching data for variable {mapped_var} in station {station_id}: {e}")
@@ -160,9 +177,7 @@ class IWINFixedSource(DataSource):
         dataset_url = data_date.strftime(url_pattern)
 
         try:
-            self.logger.info(f"Attempting to fetch dataset from {dataset_url}")
-            dataset = nc.Dataset(dataset_url)
-            return dataset
+            return self._open_dataset(dataset_url)
         except FileNotFoundError:
             self.logger.error(f"Dataset not found for station {station_id} on {data_date}")
             raise
@@ -170,5 +185,78 @@ class IWINFixedSource(DataSource):
             self.logger.error(f"Unexpected error while fetching dataset: {e}")
             raise
 
+    def _open_dataset(self, dataset_url):
+        """
+        Open a NetCDF dataset, reusing a recently opened handle for the same URL.
+
+        Opening a dataset reads and parses its header (over the network for OPeNDAP URLs),
+        so handles are kept in a small LRU cache for DATASET_CACHE_TTL seconds. Expired or
+        evicted handles are closed.
+
+        Args:
+            dataset_url (str): Path or URL of the dataset.
+
+        Returns:
+            netCDF4.Dataset: The opened dataset.
+        """
+        import netCDF4 as nc
+
+        now = time.monotonic()
+        with self._datasets_lock:
+            cached = self._datasets.pop(dataset_url, None)
+            if cached is not None:
+                opened_at, dataset = cached
+                if now - opened_at < DATASET_CACHE_TTL:
+                    self._datasets[dataset_url] = cached
+                    return dataset
+                self._close_dataset(dataset)
+
+            self.logger.info(f"Attempting to fetch dataset from {dataset_url}")
+            dataset = nc.Dataset(dataset_url)
+            if "://" not in dataset_url:
+                self._set_chunk_cache(dataset)
+            self._datasets[dataset_url] = (now, dataset)
+            while len(self._datasets) > DATASET_CACHE_SIZE:
+                _, (_, evicted) = self._datasets.popitem(last=False)
+                self._close_dataset(evicted)
+            return dataset
+
+    def _set_chunk_cache(self, dataset):
+        """
+        Enlarge the HDF5 chunk cache of every variable of a local dataset.
+
+        Remote (OPeNDAP) datasets have no HDF5 chunk cache and are left untouched.
+
+        Args:
+            dataset (netCDF4.Dataset): The opened dataset.
+        """
+        for name, variable in dataset.variables.items():
+            try:
+                variable.set_var_chunk_cache(**VARIABLE_CHUNK_CACHE)
+            except Exception as e:
+                self.logger.debug(f"Cannot set the chunk cache of variable {name}: {e}")
+
+    def _close_dataset(self, dataset):
+        """
+        Close a NetCDF dataset, ignoring errors of already closed handles.
+
+        Args:
+            dataset (netCDF4.Dataset): The dataset to close.
+        """
+        try:
+            dataset.close()
+        except Exception as e:
+            self.logger.debug(f"Error closing dataset: {e}")
+
+    def close(self):
+        """
+        Close all the datasets kept open by this source.
+        """
+        super().close()
+        with self._datasets_lock:
+            while self._datasets:
+                _, (_, dataset) = self._datasets.popitem(last=False)
+                self._close_dataset(dataset)
+
     def is_station_online(self, station_id, max_inactive_minutes=120):
         return False
@@ -2,9 +2,9 @@
 # SPDX-License-Identifier:  EUPL-1.2
 
 
-import requests
 from datetime import datetime, timedelta, timezone
 import pandas as pd
+import numpy as np
 import traceback
 
 from .datasource import DataSource
@@ -57,7 +57,7 @@ class IWOOSSource(DataSource):
         try:
             
             self.logger.info(f"Fetched real-time data for {station_id}")
-            return self.transform_realtime_data(self.open_data(station_id), station_id)
+            return self.transform_realtime_data(self.open_data(station_id, latest=True), station_id)
         except Exception as e:
             self._handle_error(e)
             return None
@@ -107,8 +107,8 @@ class IWOOSSource(DataSource):
             if resample != "AUTO" and not raw_data.empty:
                 raw_data = raw_data.resample(resample).mean().interpolate()
 
-            variable_mapping['latitude'] = 'lat'
-            variable_mapping['longitude'] = 'lon'
+            # Copy so the shared station configuration is left untouched
+            variable_mapping = {**variable_mapping, 'latitude': 'lat', 'longitude': 'lon'}
 
             raw_data = raw_data.rename(columns = {value: key for key, value in variable_mapping.items()})
             
@@ -155,12 +155,11 @@ class IWOOSSource(DataSource):
             }
 
             if data_dict:
+                # Missing and non-numeric values are checked instead of raising and catching
+                # an exception for each of them
                 for key, value in variable_mapping.items():
-                    v = data_dict.get(value, 'NA')
-                    try:
-                        observation[key] = round(v, 2)
-                    except:
-                        observation[key] = 'NA'
+                    v = data_dict.get(value)
+                    observation[key] = round(v, 2) if isinstance(v, (int, float, np.number)) else 'NA'
 
                 return {
                     "id": station_id,
@@ -234,12 +233,35 @@ class IWOOSSource(DataSource):
             )
             return False
         
-    def open_data(self, station_id):
-        a = pd.read_csv(f"https://raw.githubusercontent.com/jerabaul29/{station_id}_data/main/gps_data_{station_id}.csv", 
+    def open_data(self, station_id, latest=False):
+        """
+        Read the wave statistics of a buoy, with its position interpolated at each record.
+
+        Args:
+            station_id (str): The ID of the buoy.
+            latest (bool): Only keep (and position) the most recent wave record.
+
+        Returns:
+            pd.DataFrame: Wave statistics and position (lat, lon), indexed by time.
+        """
+        gps = pd.read_csv(f"https://raw.githubusercontent.com/jerabaul29/{station_id}_data/main/gps_data_{station_id}.csv",
                     parse_dates=True, index_col='time', usecols=['lat', 'lon', 'time'])
 
-        b = pd.read_csv(f"https://raw.githubusercontent.com/jerabaul29/{station_id}_data/main/wavestat_data_{station_id}.csv", 
+        waves = pd.read_csv(f"https://raw.githubusercontent.com/jerabaul29/{station_id}_data/main/wavestat_data_{station_id}.csv",
                     parse_dates=True, index_col='time', usecols=['pHs0', 'pT02', 'pT24', 'time'])
-        
-        return b.join(pd.concat([a,b]).sort_index().interpolate()[['lat', 'lon']])
-    
\ No newline at end of file
+
+        if latest:
+            waves = waves[waves.index == waves.index.max()]
+
+        # Positions are interpolated in time directly at the wave records, instead of merging,
+        # sorting and interpolating both tables. Records before the first GPS fix have no position.
+        gps = gps.dropna(subset=['lat', 'lon']).sort_index()
+        gps_time = gps.index.values.astype('datetime64[ns]').astype(np.int64)
+        wave_time = waves.index.values.astype('datetime64[ns]').astype(np.int64)
+        for column in ('lat', 'lon'):
+            if gps.empty:
+                waves[column] = np.nan
+            else:
+                waves[column] = np.interp(wave_time, gps_time, gps[column].to_numpy(dtype=float), left=np.nan)
+
+        return waves
@@ -7,8 +7,11 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
 
 from abc import ABC, abstractmethod
-import logging
-import json
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 from source.logger.logger import Logger
 from source.configHandler.confighandler import ConfigHandler
 
@@ -17,6 +20,22 @@ config_files = [
     'static/config/mobile_stations.json'
 ]
 
+# Connect and read timeouts (seconds) of the requests sent to the data source APIs
+REQUEST_TIMEOUT = (3.1, 10)
+# Retries of idempotent requests on connection errors, rate limiting and server errors,
+# with an exponential backoff of REQUEST_BACKOFF * 2 ** retry seconds
+REQUEST_RETRIES = 3
+REQUEST_BACKOFF = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class _APISession(requests.Session):
+    """A requests session applying REQUEST_TIMEOUT to requests sent without a timeout."""
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', REQUEST_TIMEOUT)
+        return super().request(method, url, **kwargs)
+
 
 class DataSource(ABC):
     """
@@ -28,6 +47,9 @@ class DataSource(ABC):
         logger (logging.Logger): Logger for recording actions and errors.
     """
 
+    # Set by data sources whose API returns the real-time data of several stations in one request
+    BATCH_REALTIME = False
+
     def __init__(self, api_key=None):
         """
         Initialize the DataSource with an optional API key and set up a logger.
@@ -65,6 +87,21 @@ class DataSource(ABC):
         """
         pass
 
+    def fetch_realtime_data_batch(self, station_ids):
+        """
+        Retrieve real-time observational data for several stations of this data source.
+
+        The stations are fetched one by one. Data sources able to request several stations
+        at once override this method and set BATCH_REALTIME.
+
+        Args:
+            station_ids (list): The IDs of the stations to fetch real-time data for.
+
+        Returns:
+            dict: Transformed real-time data of each station (None if unavailable), keyed by station ID.
+        """
+        return {station_id: self.fetch_realtime_data(station_id) for station_id in station_ids}
+
     @abstractmethod
     def fetch_timeseries_data(self, station_id, start_time, end_time, return_df = False):
         """
@@ -122,6 +159,40 @@ class DataSource(ABC):
         """
         pass
 
+    @staticmethod
+    def _create_session(auth=None):
+        """
+        Create the HTTP session used to query a data source API.
+
+        Connections are kept alive and pooled across requests, and failed requests are
+        retried with a backoff. The response of the last attempt is returned as is, so
+        callers keep checking the status code.
+
+        Args:
+            auth (tuple, optional): Credentials sent with every request.
+
+        Returns:
+            requests.Session: The configured session.
+        """
+        session = _APISession()
+        session.auth = auth
+        retries = Retry(total=REQUEST_RETRIES, backoff_factor=REQUEST_BACKOFF,
+                        status_forcelist=RETRY_STATUSES, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def close(self):
+        """
+        Release the resources held by the data source, such as pooled HTTP connections.
+
+        Data sources keeping other resources open (e.g. datasets) extend this method.
+        """
+        session = getattr(self, 'session', None)
+        if session is not None:
+            session.close()
+
     def _handle_error(self, error):
         """
         Log and handle errors during data fetching or processing.
@@ -131,6 +202,24 @@ class DataSource(ABC):
         """
         self.logger.error(f"Error occurred: {error}")
 
+    @staticmethod
+    def _element_lookup(variable_mapping):
+        """
+        Build the reverse lookup of a station's variable mapping.
+
+        Args:
+            variable_mapping (dict): Mapping of variable names to the data source element IDs.
+
+        Returns:
+            dict: Mapping of element IDs to variable names. When several variables use the same
+                  element, the first one of the mapping is kept.
+        """
+        lookup = {}
+        for variable, element_id in (variable_mapping or {}).items():
+            if element_id is not None:
+                lookup.setdefault(element_id, variable)
+        return lookup
+
     def df_to_timeserie(self, df):
         """
         Convert a DataFrame to a list of time series observations.
@@ -142,22 +231,37 @@ class DataSource(ABC):
             list: A list of dictionaries representing time series data.
         """
         try:
-            keys = df.columns.tolist()  # Get column names
+            keys = [key for key in df.columns if key not in ('latitude', 'longitude')]
             timeserie = []
 
-            for index, row in df.iterrows():
-                lat, lon = None, None
-                obs = {'timestamp': index.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'}  # Use the index as the timestamp
-                for key in keys:
-                    if key == 'latitude':
-                        lat = row.get(key,None)
-                    elif key == 'longitude':
-                        lon = row.get(key,None)
-                    else:
-                        obs[key] = float(f"{row[key]:.2f}")  # Access row data using the column name
-                
-                if lat and lon:
-                    obs["location"] = {"lat": float(f"{lat:.4f}"), "lon": float(f"{lon:.4f}")}
+            # Positions of mobile stations are rounded and validated for the whole track at once
+            locations = None
+            if 'latitude' in df.columns and 'longitude' in df.columns:
+                lat = df['latitude'].astype(float)
+                lon = df['longitude'].astype(float)
+                has_location = (lat.notna() & lon.notna() & (lat != 0) & (lon != 0)).tolist()
+                locations = zip(lat.round(4).tolist(), lon.round(4).tolist(), has_location)
+
+            # Values are rounded for the whole frame at once, missing values become None (null in JSON)
+            values = df[keys].astype(float).round(2)
+            values = values.astype(object).where(values.notna(), None)
+
+            # Timestamps are formatted for the whole index at once, to the millisecond, from the wall time
+            index = pd.DatetimeIndex(df.index)
+            if index.tz is not None:
+                index = index.tz_localize(None)
+            timestamps = np.char.add(np.datetime_as_string(index.values.astype('datetime64[ms]'), unit='ms'), 'Z')
+
+            # Rows are assembled from whole columns instead of building a Series per row
+            columns = [values[key].tolist() for key in keys]
+            for timestamp, row in zip(timestamps.tolist(), zip(*columns) if columns else ((),) * len(df)):
+                obs = {'timestamp': timestamp}  # Use the index as the timestamp
+                obs.update(zip(keys, row))
+
+                if locations is not None:
+                    lat, lon, valid = next(locations)
+                    if valid:
+                        obs["location"] = {"lat": lat, "lon": lon}
                 timeserie.append(obs)
 
             return timeserie
@@ -30,12 +30,15 @@ def get_datasource(station_id, config=None):
 
     Args:
         station_id (str): The ID of the station.
+        config (ConfigHandler, optional): Already loaded configuration handler to reuse.
+            A new one is only created when none is given.
 
     Returns:
         DataSource: An instance of the correct subclass.
     """
     logger = Logger.setup_logger("get_datasource")
-    config = ConfigHandler()
+    if config is None:
+        config = ConfigHandler()
 
     logger.info(f"Fetching metadata for station_id: {station_id}")
     station = config.get_metadata(station_id)
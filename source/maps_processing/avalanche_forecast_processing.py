@@ -1,20 +1,18 @@
-import sys
 import os
+import gzip
 import requests
 from datetime import datetime, timedelta
 import geopandas as gpd
 from shapely.geometry import mapping, Polygon, MultiPolygon
-from shapely.ops import transform
 import geojson
-import matplotlib.pyplot as plt
-import json
 import traceback
-from pyproj import CRS, Transformer
+from pyproj import CRS
 import urllib.parse
 
 
 from source.logger.logger import Logger
 from source.maps_processing.maps_caching import MapsCaching
+from source.maps_processing.sea_ice_map_processing import GZIP_LEVEL, READ_FILE_OPTIONS, geojson_bytes
 
 
 class AvalancheForecastProcessing:
@@ -160,8 +158,11 @@ class AvalancheForecastProcessing:
             Exception: Logs any exceptions that occur during the creation of the GeoJSON, including a full traceback.
         """
         try:
+            # matplotlib is only needed here, import it lazily (without pyplot) to keep startup light
+            import matplotlib
+
             # Use the specified colormap from matplotlib
-            cmap = plt.cm.get_cmap(colormap, len(gdf_dicts))
+            cmap = matplotlib.colormaps[colormap].resampled(max(len(gdf_dicts), 1))
 
             # Define the target CRS (WGS 84)
             target_crs = CRS.from_epsg(4326)
@@ -175,22 +176,13 @@ class AvalancheForecastProcessing:
                 # Get a color from the colormap
                 color = cmap(i)
 
-                # Aggregate all geometries into a list of Polygons
-                polygons = []
-                for _, row in gdf.iterrows():
-                    geometry = row['geometry']
-                    if isinstance(geometry, Polygon):
-                        polygons.append(geometry)
-                    elif isinstance(geometry, MultiPolygon):
-                        polygons.extend(geometry.geoms)
-
-                # Ensure that polygons is a list of valid polygons
-                if polygons:
-                    # Transform each polygon to the target CRS
-                    transformer = Transformer.from_crs(gdf.crs, target_crs, always_xy=True)
-                    transformed_polygons = [transform(transformer.transform, polygon) for polygon in polygons]
+                # Keep the polygonal geometries, reproject them at once and split multipolygons into polygons
+                geometries = gdf.geometry
+                polygons = geometries[geometries.geom_type.isin(('Polygon', 'MultiPolygon'))]
 
-                    multipolygon = MultiPolygon(transformed_polygons)
+                if not polygons.empty:
+                    polygons = polygons.to_crs(target_crs).explode(index_parts=False)
+                    multipolygon = MultiPolygon(polygons.tolist())
 
                     feature = geojson.Feature(
                         geometry=mapping(multipolygon),
@@ -232,9 +224,13 @@ class AvalancheForecastProcessing:
             # Construct the full file path
             file_path = os.path.join(self.export_directory, f"{str(file_name)}.geojson")
 
-            # Save the GeoJSON object to the file
-            with open(file_path, 'w') as file:
-                json.dump(geojson_obj, file, indent=2)
+            # Save the GeoJSON object to the file, with a pre-compressed copy served to
+            # clients accepting gzip. The files are only read by the map, so they are not indented.
+            encoded = geojson_bytes(geojson_obj)
+            with open(file_path, 'wb') as file:
+                file.write(encoded)
+            with gzip.open(file_path + '.gz', 'wb', compresslevel=GZIP_LEVEL) as file:
+                file.write(encoded)
             self.logger.info(f"GeoJSON saved successfully to {file_path}")
         except Exception as e:
             self.logger.error(f"Error saving GeoJSON to file: {e}")
@@ -275,7 +271,7 @@ class AvalancheForecastProcessing:
         gdf_polygon = gpd.GeoDataFrame(index=[0], crs='EPSG:4326', geometry=[polygon])
 
         # Read the shapefile
-        gdf = gpd.read_file(shapefile_path)
+        gdf = gpd.read_file(shapefile_path, **READ_FILE_OPTIONS)
 
         # Log CRS information
         self.logger.info(f"Initial Shapefile CRS: {gdf.crs}")
@@ -526,7 +522,28 @@ class AvalancheForecastProcessing:
         except Exception as e:
             self.logger.error(f"Error processing forecast: {e}")
 
-    def process_3003(self):
+    def _is_recent_export(self, file_name, max_age_minutes):
+        """
+        Checks if an exported GeoJSON file exists and is recent based on its modification time.
+
+        A file written on a previous day is never recent, since the exported layers are named
+        by day offset and shift at midnight.
+
+        Args:
+            file_name (str): The name of the exported file, without the file extension.
+            max_age_minutes (int): Maximum age of the file in minutes to be considered recent.
+
+        Returns:
+            bool: True if the file was written today and is recent, False otherwise.
+        """
+        file_path = os.path.join(self.export_directory, f"{str(file_name)}.geojson")
+        if not os.path.exists(file_path):
+            return False
+        file_mod_time = datetime.fromtimestamp(os.path.getmtime(file_path))
+        now = datetime.now()
+        return file_mod_time.date() == now.date() and now - file_mod_time <= timedelta(minutes=max_age_minutes)
+
+    def process_3003(self, force=False, max_age_minutes=60):
         """
         Processes avalanche forecast data specifically for region '3003' (Nordenskiöld Land).
 
@@ -539,11 +556,21 @@ class AvalancheForecastProcessing:
         2. Fetches avalanche forecast data for the specified number of days.
         3. Creates a GeoJSON layer for the region's forecast data and saves it as a file.
 
+        The whole processing is skipped while the layer of the current day is more recent than
+        `max_age_minutes`, unless `force` is set.
+
+        Args:
+            force (bool): Force processing even if a recent GeoJSON file exists.
+            max_age_minutes (int): Maximum age in minutes of an existing layer to skip processing.
+
         Raises:
             Exception: Logs any exceptions that occur during the processing of the forecast data.
         """
         if self.serve_only:
             return -1
+        if not force and self._is_recent_export(0, max_age_minutes):
+            self.logger.info("Avalanche forecast layer is recent. Skipping processing.")
+            return
         self.fetch_region_data()
         self.fetch_forecast_data()
         self._create_forecast_layer_region(self.get_region('3003'))
@@ -7,7 +7,7 @@ import rasterio
 from rasterio.features import shapes
 import numpy as np
 import geopandas as gpd
-from shapely.geometry import shape, Polygon
+from shapely.geometry import shape
 from source.logger.logger import Logger
 from tqdm import tqdm
 
@@ -22,6 +22,15 @@ ORIENTATION_RANGES = {
     'NW': [(315, 360)]
 }
 
+# Lower bounds of the 45 degree aspect sectors, and the sectors covered by each orientation,
+# so that an aspect raster is binned once instead of being compared range by range.
+ASPECT_SECTOR_EDGES = np.arange(0, 361, 45)
+ORIENTATION_SECTORS = {
+    orientation: [int(np.searchsorted(ASPECT_SECTOR_EDGES, min_aspect, side='right')) - 1
+                  for min_aspect, _ in ranges]
+    for orientation, ranges in ORIENTATION_RANGES.items()
+}
+
 class MapsCaching:
     """
     A class to manage the downloading and processing of Digital Elevation Models (DEMs),
@@ -115,19 +124,19 @@ class MapsCaching:
         """
         Searches for an existing Digital Elevation Model (DEM) file within the managed directory.
 
-        This method iterates over the keys in the `DEM_res` dictionary, constructing filenames based on
-        the resolution keys. It then checks the 'managed' subdirectory for files matching the constructed
-        pattern and returns the path of the first matching file found.
+        This method lists the 'managed' subdirectory once, then iterates over the keys in the `DEM_res`
+        dictionary and returns the path of the first file matching the pattern of a resolution key.
 
         Returns:
             str or None: The file path of the existing DEM file if found. Returns None if no matching
                          DEM file is found in the managed directory.
         """
         managed_path = os.path.join(self.path, 'managed')
+        # The directory is listed once, the resolutions are then matched in order of preference
+        tif_files = [file for file in os.listdir(managed_path) if file.endswith('.tif')]
         for res in self.DEM_res.keys():
-            dem_filename = f"{res}_DEM_*.tif"
-            for file in os.listdir(managed_path):
-                if file.startswith(f"{res}_DEM_") and file.endswith('.tif'):
+            for file in tif_files:
+                if file.startswith(f"{res}_DEM_"):
                     return os.path.join(managed_path, file)
         return None
 
@@ -197,7 +206,7 @@ class MapsCaching:
             response.raise_for_status()
 
             total_size = int(response.headers.get('content-length', 0))
-            block_size = 1024  # 1 Kibibyte
+            block_size = 1024 * 1024  # 1 Mebibyte, the loop overhead dominates with smaller blocks
 
             with tempfile.TemporaryDirectory() as temp_dir:
                 zip_path = os.path.join(temp_dir, 'temp.zip')
@@ -339,11 +348,10 @@ class MapsCaching:
                 if orientations:
                     with rasterio.open(aspect_path) as src_aspect:
                         aspect = src_aspect.read(1)
-                        orientation_mask = np.zeros_like(aspect, dtype=bool)
-                        for orientation in orientations:
-                            for min_aspect, max_aspect in ORIENTATION_RANGES[orientation]:
-                                orientation_mask |= (aspect >= min_aspect) & (aspect < max_aspect)
-                        mask = mask & orientation_mask
+                        sectors = np.searchsorted(ASPECT_SECTOR_EDGES, aspect, side='right') - 1
+                        selected = [sector for orientation in orientations
+                                    for sector in ORIENTATION_SECTORS[orientation]]
+                        mask = mask & np.isin(sectors, selected)
 
                 if elevation_start is not None or elevation_end is not None:
                     with rasterio.open(self.DEM_path) as src_dem:
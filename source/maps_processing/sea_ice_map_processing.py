@@ -1,20 +1,102 @@
 import sys
 import os
 import gc
+import gzip
 import tempfile
 import zipfile
 import json
+import random
 import re
+import shutil
+import threading
+import time
 from datetime import datetime, timedelta
 import requests
+import numpy as np
+import pandas as pd
 import geopandas as gpd
-from shapely.geometry import box, mapping
+import shapely
+from shapely.geometry import box
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyogrio
+    import pyarrow
+except ImportError:
+    pyogrio = None
 
 # Add the parent directory to the system path to access the logger module
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
 
 from source.logger.logger import Logger
 
+# Attempts made to download the ice chart, and base delay in seconds of the exponential
+# backoff between them. Only network errors and server errors (5xx) are retried.
+DOWNLOAD_ATTEMPTS = 4
+DOWNLOAD_BACKOFF = 2
+DOWNLOAD_TIMEOUT = 60
+# Bytes copied at a time when streaming a download to disk. Small blocks make the
+# Python loop, not the network, the bottleneck for files of several megabytes.
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Land polygons already parsed and reprojected, keyed by shapefile path, modification
+# time and target CRS. The land shapefile is static, so this is read once per process.
+LAND_CACHE_SIZE = 4
+_land_frames = {}
+_land_frames_lock = threading.Lock()
+
+# Compression level of the pre-compressed GeoJSON copies. The fastest level already
+# shrinks the polygons several times, higher levels mostly cost CPU.
+GZIP_LEVEL = 1
+
+# Shapefiles are read by pyogrio into Arrow buffers when available, instead of the
+# feature by feature reads of fiona (the default engine before geopandas 1.0).
+READ_FILE_OPTIONS = {"engine": "pyogrio", "use_arrow": True} if pyogrio is not None else {}
+
+def geojson_bytes(data):
+    """
+    Serialize a GeoJSON object to UTF-8 encoded JSON, with orjson when it is installed.
+
+    orjson formats the coordinates of large feature collections several times faster than
+    the standard library encoder.
+
+    Args:
+        data (dict): The GeoJSON object.
+
+    Returns:
+        bytes: The encoded GeoJSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data).encode("utf-8")
+
+def feature_collection_bytes(collection, features, geometries):
+    """
+    Encode a GeoJSON FeatureCollection whose geometries are shapely geometries.
+
+    The geometries are encoded by GEOS in a single vectorized call and spliced into the
+    document as they are, instead of converting every coordinate to Python tuples with
+    `mapping` and encoding them again.
+
+    Args:
+        collection (dict): Members of the FeatureCollection, other than its features.
+        features (list): Features without their "geometry" member.
+        geometries (list): Shapely geometry of each feature.
+
+    Returns:
+        bytes: The encoded GeoJSON document.
+    """
+    geometry_json = shapely.to_geojson(np.array(geometries, dtype=object))
+    encoded_features = [
+        geojson_bytes(feature)[:-1] + b',"geometry":' + geometry.encode("utf-8") + b"}"
+        for feature, geometry in zip(features, geometry_json)
+    ]
+    return geojson_bytes(collection)[:-1] + b',"features":[' + b",".join(encoded_features) + b"]}"
+
 class SeaIceCache:
     """
     A class to handle caching and processing of sea ice data.
@@ -36,6 +118,8 @@ class SeaIceCache:
         self.output_dir = output_dir
         self.shapefile_path = shapefile_path
         self.logger = Logger.setup_logger('Sea Ice Caching')
+        # Kept for the lifetime of the cache, so retries and later refreshes reuse the connection
+        self.session = requests.Session()
         os.makedirs(self.output_dir, exist_ok=True)
 
         if os.environ.get('SWI_INSTANCE_SERVE_ONLY') == 'true' or serve_only:
@@ -59,7 +143,11 @@ class SeaIceCache:
         svalbard_geom = box(*svalbard_bbox)
         svalbard_gdf = gpd.GeoDataFrame([1], geometry=[svalbard_geom], crs=gdf.crs)
 
-        gdf_clipped = gpd.clip(gdf, svalbard_gdf)
+        # Polygons lying inside the bounding box are kept as they are, only the ones crossing
+        # its edge are intersected. The box is prepared once for all the containment tests.
+        shapely.prepare(svalbard_geom)
+        inside = shapely.contains_properly(svalbard_geom, gdf.geometry.to_numpy())
+        gdf_clipped = pd.concat([gdf[inside], gpd.clip(gdf[~inside], svalbard_gdf)])
         self.logger.info("GeoDataFrame clipped to Svalbard bounding box.")
 
         # Check if gdf_clipped is empty
@@ -67,19 +155,104 @@ class SeaIceCache:
             self.logger.warning("Clipped GeoDataFrame is empty.")
             return gdf_clipped
 
-        land_gdf = gpd.read_file(self.shapefile_path).to_crs(gdf.crs)
+        land_gdf = self._load_land(gdf.crs)
 
         # Check if land_gdf is empty
         if land_gdf.empty:
             self.logger.warning("Land GeoDataFrame is empty.")
             return gdf_clipped
 
-        gdf_water_only = gpd.overlay(gdf_clipped, land_gdf, how="difference")
+        gdf_water_only = self._subtract_land(gdf_clipped, land_gdf)
 
         self.logger.info("Land areas successfully masked out.")
         return gdf_water_only
 
 
+    def _load_land(self, crs):
+        """
+        Loads the land polygons in the given CRS, reusing the result of previous calls.
+
+        The parsed, reprojected and repaired land (with its spatial index, built on first use)
+        is kept in memory until the shapefile is modified.
+
+        Args:
+            crs (pyproj.CRS): CRS of the ice chart.
+
+        Returns:
+            GeoDataFrame: The land polygons in `crs`.
+        """
+        path = self.shapefile_path
+        if os.path.isdir(path):
+            with os.scandir(path) as entries:
+                mtime = max((entry.stat().st_mtime for entry in entries), default=0)
+        else:
+            mtime = os.path.getmtime(path)
+        key = (os.path.abspath(path), mtime, crs.to_wkt() if crs is not None else None)
+
+        with _land_frames_lock:
+            land_gdf = _land_frames.get(key)
+        if land_gdf is not None:
+            return land_gdf
+
+        land_gdf = gpd.read_file(path, **READ_FILE_OPTIONS)
+        # geopandas only skips identical CRS definitions: an equivalent one (e.g. parsed
+        # from a .prj file) would still send every land vertex through PROJ
+        if land_gdf.crs is not None and land_gdf.crs.equals(crs, ignore_axis_order=True):
+            land_gdf = land_gdf.set_crs(crs, allow_override=True)
+        else:
+            land_gdf = land_gdf.to_crs(crs)
+
+        # Invalid land polygons are repaired here once, instead of on every subtraction
+        land = land_gdf.geometry.to_numpy()
+        invalid = ~shapely.is_valid(land)
+        if invalid.any():
+            land = land.copy()
+            land[invalid] = shapely.make_valid(land[invalid])
+            land_gdf = land_gdf.set_geometry(land)
+
+        with _land_frames_lock:
+            _land_frames[key] = land_gdf
+            while len(_land_frames) > LAND_CACHE_SIZE:
+                _land_frames.pop(next(iter(_land_frames)))
+        return land_gdf
+
+    @staticmethod
+    def _subtract_land(gdf, land_gdf):
+        """
+        Removes the land polygons from the geometries of a GeoDataFrame.
+
+        Each geometry is only differenced once, with the union of the land polygons found to
+        intersect it through the spatial index of the land, instead of subtracting every land
+        polygon in turn. Geometries left empty are dropped, and only polygonal geometries are kept.
+
+        Args:
+            gdf (GeoDataFrame): Input GeoDataFrame with polygonal geometries.
+            land_gdf (GeoDataFrame): Valid land polygons, in the CRS of `gdf`.
+
+        Returns:
+            GeoDataFrame: GeoDataFrame with the land areas removed and a fresh index.
+        """
+        geometries = gdf.geometry.to_numpy().copy()
+        invalid = ~shapely.is_valid(geometries)
+        geometries[invalid] = shapely.make_valid(geometries[invalid])
+
+        land = land_gdf.geometry.to_numpy()
+
+        gdf_idx, land_idx = land_gdf.sindex.query(geometries, predicate="intersects", sort=True)
+        if len(gdf_idx):
+            touched, starts = np.unique(gdf_idx, return_index=True)
+            masks = [shapely.union_all(land[group]) for group in np.split(land_idx, starts[1:])]
+            geometries[touched] = shapely.difference(geometries[touched], masks)
+
+        # Collections (e.g. from invalid inputs) are reduced to their polygonal parts
+        for i in np.flatnonzero(shapely.get_type_id(geometries) == shapely.GeometryType.GEOMETRYCOLLECTION):
+            parts = shapely.get_parts(geometries[i])
+            geometries[i] = shapely.union_all(parts[shapely.get_dimensions(parts) == 2])
+
+        result = gdf.set_geometry(geometries)
+        result = result[~result.is_empty & result.geom_type.isin(["Polygon", "MultiPolygon"])]
+        return result.reset_index(drop=True)
+
     def is_recent_file(self, filepath, max_age_minutes=30):
         """
         Checks if a file is recent based on its modification time.
@@ -96,6 +269,47 @@ class SeaIceCache:
         file_mod_time = datetime.fromtimestamp(os.path.getmtime(filepath))
         return datetime.now() - file_mod_time <= timedelta(minutes=max_age_minutes)
 
+    def _download(self, url, file_path):
+        """
+        Downloads a file, retrying transient failures with an exponential backoff.
+
+        Args:
+            url (str): URL of the file to download.
+            file_path (str): Path where the file is written.
+
+        Raises:
+            Exception: If the server answers with a client error, or if every attempt failed.
+        """
+        for attempt in range(1, DOWNLOAD_ATTEMPTS + 1):
+            self.logger.info(f"Downloading data from {url}...")
+            try:
+                response = self.session.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT)
+                try:
+                    if response.status_code == 200:
+                        # Copied from the raw stream (decompressing any transfer encoding) in large blocks
+                        response.raw.decode_content = True
+                        with open(file_path, "wb") as file:
+                            shutil.copyfileobj(response.raw, file, DOWNLOAD_CHUNK_SIZE)
+                        self.logger.info("Download complete.")
+                        return
+                    self.logger.error(f"Failed to download file: {response.status_code}")
+                    if response.status_code < 500:
+                        raise Exception(f"Download failed: {response.status_code}")
+                    error = response.status_code
+                finally:
+                    # Give the connection back to the session pool
+                    response.close()
+            except requests.RequestException as e:
+                self.logger.error(f"Failed to download file: {e}")
+                error = e
+
+            if attempt < DOWNLOAD_ATTEMPTS:
+                delay = DOWNLOAD_BACKOFF * 2 ** (attempt - 1) + random.random()
+                self.logger.info(f"Retrying download in {delay:.1f} seconds ({attempt}/{DOWNLOAD_ATTEMPTS})")
+                time.sleep(delay)
+
+        raise Exception(f"Download failed: {error}")
+
     def create_ice_chart_geojson(self, output_geojson="ice_chart.geojson",
                                  url="https://cryo.met.no/sites/cryo/files/latest/NIS_arctic_latest_pl_a.zip",
                                  force=False):
@@ -120,50 +334,35 @@ class SeaIceCache:
 
         with tempfile.TemporaryDirectory() as temp_dir:
             zip_file_path = os.path.join(temp_dir, "NIS_arctic_latest.zip")
-            self.logger.info(f"Downloading data from {url}...")
-            response = requests.get(url, stream=True)
-
-            if response.status_code == 200:
-                with open(zip_file_path, "wb") as file:
-                    for chunk in response.iter_content(chunk_size=1024):
-                        file.write(chunk)
-                self.logger.info("Download complete.")
-            else:
-                self.logger.error(f"Failed to download file: {response.status_code}")
-                raise Exception(f"Download failed: {response.status_code}")
+            self._download(url, zip_file_path)
 
+            # The shapefile is read from the archive through GDAL's zip file system, instead
+            # of writing the extracted files to disk and reading them back
             with zipfile.ZipFile(zip_file_path, "r") as zip_ref:
-                zip_ref.extractall(temp_dir)
-
-            shapefiles = [f for f in os.listdir(temp_dir) if f.endswith(".shp")]
+                shapefiles = [f for f in zip_ref.namelist() if f.endswith(".shp")]
             if not shapefiles:
                 raise FileNotFoundError("No shapefile found in the downloaded ZIP.")
 
-            shapefile_path = os.path.join(temp_dir, shapefiles[0])
-            gdf = gpd.read_file(shapefile_path)
+            shapefile_path = f"/vsizip/{zip_file_path}/{shapefiles[0]}"
+            gdf = gpd.read_file(shapefile_path, **READ_FILE_OPTIONS)
             gdf = self.clip_and_mask_water_area(gdf)
 
             class_colors = {
                 "Fast Ice": "#808080", "Very Close Drift Ice": "#FF0000", "Close Drift Ice": "#FFA500",
                 "Open Drift Ice": "#FFFF00", "Very Open Drift Ice": "#90EE90", "Open Water": "#ADD8E6"
             }
-            if "Ice Free" in gdf["NIS_CLASS"].unique():
-                gdf = gdf[gdf["NIS_CLASS"] != "Ice Free"]
+            # Only the displayed classes are merged, with a single grouped dissolve
+            gdf = gdf[gdf["NIS_CLASS"].isin(class_colors.keys())]
+            dissolved = gdf.dissolve(by="NIS_CLASS").geometry
 
-            features = []
+            features, geometries = [], []
             for nis_class, color in class_colors.items():
-                if nis_class in gdf["NIS_CLASS"].unique():
-                    class_gdf = gdf[gdf["NIS_CLASS"] == nis_class]
-                    dissolved = class_gdf.dissolve(by="NIS_CLASS").geometry.iloc[0]
+                if nis_class in dissolved.index:
                     features.append({
                         "type": "Feature",
                         "properties": {"name": nis_class, "color": color},
-                        "geometry": mapping(dissolved),
                     })
-
-                    # Explicitly delete and collect garbage
-                    del class_gdf, dissolved
-                    gc.collect()
+                    geometries.append(dissolved.loc[nis_class])
 
             match = re.search(r"NIS_arctic_(\d{8})_pl_a\.shp", shapefile_path)
             if match:
@@ -172,17 +371,20 @@ class SeaIceCache:
 
             geojson_data = {
                 "type": "FeatureCollection",
-                "features": features,
                 "date": date_obj.isoformat(),
                 "lastDownload": datetime.now().isoformat()
             }
 
-            with open(geojson_path, "w") as f:
-                json.dump(geojson_data, f)
+            encoded = feature_collection_bytes(geojson_data, features, geometries)
+            with open(geojson_path, "wb") as f:
+                f.write(encoded)
+            # Pre-compressed copy served to clients accepting gzip
+            with gzip.open(geojson_path + ".gz", "wb", compresslevel=GZIP_LEVEL) as f:
+                f.write(encoded)
             self.logger.info(f"GeoJSON file created: {geojson_path}")
 
             # Explicitly delete and collect garbage
-            del gdf, features, geojson_data
+            del gdf, dissolved, features, geometries, geojson_data, encoded
             gc.collect()
 
         return geojson_path
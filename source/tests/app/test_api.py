@@ -125,3 +125,78 @@ def test_hourly_data_invalid_shift(client):
     response = client.get(f"/api/station-data/{station_id}?data={invalid_shift}")
     assert response.status_code == 400
     assert response.get_json()["error"] == "Invalid request"
+
+def test_realtime_data_response_is_cached(client, app):
+    """Test that repeated /station-data/<station_id>?data=now calls reuse the serialized response."""
+    station_id = "12345"
+    handler = app.config['STATION_HANDLER']
+    for _ in range(3):
+        response = client.get(f"/api/station-data/{station_id}?data=now")
+        assert response.status_code == 200
+    assert handler.get_cached_realtime_data.call_count == 1
+
+def test_realtime_data_response_dropped_after_refresh(client, app):
+    """Test that a refresh of the station caches invalidates the serialized responses."""
+    station_id = "12345"
+    handler = app.config['STATION_HANDLER']
+    client.get(f"/api/station-data/{station_id}?data=now")
+    app.config['STATION_CACHE_VERSION'] = app.config.get('STATION_CACHE_VERSION', 0) + 1
+    client.get(f"/api/station-data/{station_id}?data=now")
+    assert handler.get_cached_realtime_data.call_count == 2
+
+def test_realtime_data_conditional_request(client):
+    """Test that a request with the ETag of the current response is answered with 304."""
+    response = client.get("/api/station-data/12345?data=now")
+    etag = response.headers["ETag"]
+
+    response = client.get("/api/station-data/12345?data=now", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+
+def test_unknown_station_rejected(client, app):
+    """Test that IDs missing from the configuration are rejected without loading any data."""
+    handler = app.config['STATION_HANDLER']
+    handler.is_known_station.return_value = False
+
+    for url in ("/api/station/unknown", "/api/station-data/unknown?data=now", "/api/station-data/unknown?data=-1"):
+        response = client.get(url)
+        assert response.status_code == 404
+        assert response.get_json()["error"] == "Station not found"
+
+    handler.get_cached_station_metadata.assert_not_called()
+    handler.get_cached_realtime_data.assert_not_called()
+    handler.get_cached_hourly_data.assert_not_called()
+    assert not app.config.get('API_RESPONSE_CACHE')
+
+def test_json_provider_matches_default_provider(app):
+    """Test that responses keep the key order and date format of Flask's default JSON provider."""
+    from datetime import datetime
+    from flask.json.provider import DefaultJSONProvider
+
+    data = {"b": 1, "a": {"d": datetime(2025, 1, 2, 3, 4, 5), "c": None}}
+    encoded = app.json.dumps(data)
+
+    assert json.loads(encoded) == json.loads(DefaultJSONProvider(app).dumps(data))
+    assert encoded.index('"a"') < encoded.index('"b"')
+    assert app.json.dumps(data, indent=2) == DefaultJSONProvider(app).dumps(data, indent=2)
+
+def test_unknown_station_type_rejected(client, app):
+    """Test that unknown station types are rejected without loading or caching any data."""
+    handler = app.config['STATION_HANDLER']
+    handler.is_known_station_type.return_value = False
+
+    for url in ("/api/station/online?type=unknown", "/api/station/offline?type=unknown"):
+        response = client.get(url)
+        assert response.status_code == 400
+        assert response.get_json()["error"] == "Invalid station type"
+
+    handler.get_cached_online_stations.assert_not_called()
+    assert not app.config.get('API_RESPONSE_CACHE')
+
+def test_response_cache_is_bounded(client, app):
+    """Test that the response cache keeps at most RESPONSE_CACHE_SIZE entries, the most recent ones."""
+    with patch("source.app.api.RESPONSE_CACHE_SIZE", 3):
+        for shift in range(1, 11):
+            assert client.get(f"/api/station-data/12345?data=-{shift}").status_code == 200
+
+    assert list(app.config['API_RESPONSE_CACHE']) == [('shift', '12345', -shift) for shift in range(8, 11)]
@@ -76,3 +76,22 @@ def test_maps_ice_chart_not_exists(mock_exists, client):
 
     data = json.loads(response.data)
     assert "error" in data
+
+
+def test_get_version_info_reads_file_once(tmp_path, monkeypatch):
+    """
+    Test that the version file is only read again once it has been modified.
+    """
+    from source.app.pages import get_version_info
+
+    version_file = tmp_path / "version"
+    version_file.write_text("Codename\n1.2.3\nbeta\n")
+    monkeypatch.chdir(tmp_path)
+
+    assert get_version_info() == "Codename (build 1.2.3) - beta"
+    with patch("builtins.open", side_effect=AssertionError("version file read again")):
+        assert get_version_info() == "Codename (build 1.2.3) - beta"
+
+    version_file.write_text("Codename\n1.2.4\n")
+    os.utime(version_file, (0, 0))
+    assert get_version_info() == "Codename (build 1.2.4)"
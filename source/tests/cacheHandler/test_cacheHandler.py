@@ -176,6 +176,88 @@ class TestCacheHandler:
             data = json.load(f)
         assert "temp" in data
 
+    @patch("source.cacheHandler.cacheHandler.get_datasource")
+    def test_cache_past_hourly_data_skips_failing_station(
+        self,
+        mock_get_datasource,
+        cache_handler
+    ):
+        import pandas as pd
+
+        cache_handler.online_stations = ["station_fail", "station_ok"]
+
+        now = pd.Timestamp.now(tz="UTC").floor("h")
+        df = pd.DataFrame({"temp": [1.0, 2.0, 3.0]}, index=pd.date_range(now - pd.Timedelta(hours=2), now, freq="h"))
+
+        failing = MagicMock()
+        failing.fetch_timeseries_data.side_effect = RuntimeError("API down")
+        working = MagicMock()
+        working.fetch_timeseries_data.return_value = df
+        working.df_to_timeserie.side_effect = lambda frame: [
+            {"timestamp": t.strftime("%Y-%m-%dT%H:%M:%S.000Z"), "temp": v} for t, v in frame["temp"].items()]
+        mock_get_datasource.side_effect = lambda station, config=None: failing if station == "station_fail" else working
+
+        cache_handler.cache_past_hourly_data(hours_ago=2)
+
+        with open(os.path.join(cache_handler.directory, "000_hourly_data", "-1.json"), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        assert list(data) == ["station_ok"]
+        assert data["station_ok"]["timeseries"][0]["temp"] == 2.0
+
+    @patch("source.cacheHandler.cacheHandler.get_datasource")
+    def test_cache_stations_status_keeps_station_order(
+        self,
+        mock_get_datasource,
+        cache_handler,
+        mock_config_handler,
+        temp_cache_dir
+    ):
+        """
+        Test that the stations checked concurrently are gathered in the configuration order.
+        """
+        stations = [f"station{i}" for i in range(10)]
+        mock_config_handler.get_stations.return_value = stations
+        cache_handler.path_config["station_status"] = str(temp_cache_dir / "status")
+
+        def datasource(station_id, config=None):
+            ds = MagicMock()
+            ds.is_station_online.return_value = int(station_id[-1]) % 3 != 0
+            return ds
+        mock_get_datasource.side_effect = datasource
+
+        result = cache_handler.cache_stations_status()
+
+        assert list(result) == stations
+        assert cache_handler.online_stations == [s for s in stations if int(s[-1]) % 3 != 0]
+        assert result["station3"]["status"] == "offline"
+
+    @patch("source.cacheHandler.cacheHandler.get_datasource")
+    def test_datasources_reused_until_close(
+        self,
+        mock_get_datasource,
+        cache_handler,
+        mock_config_handler,
+        temp_cache_dir
+    ):
+        """
+        Test that the caching steps share one data source per station until close is called.
+        """
+        mock_config_handler.get_stations.return_value = ["station1", "station2"]
+        cache_handler.path_config["station_status"] = str(temp_cache_dir / "status")
+        mock_get_datasource.side_effect = lambda station_id, config=None: MagicMock(BATCH_REALTIME=False)
+
+        cache_handler.cache_stations_status()
+        cache_handler.cache_realtime_data()
+        assert mock_get_datasource.call_count == 2
+
+        datasources = list(cache_handler._datasources.values())
+        cache_handler.close()
+        for datasource in datasources:
+            datasource.close.assert_called_once()
+
+        cache_handler.cache_realtime_data()
+        assert mock_get_datasource.call_count == 4
+
     @patch("source.cacheHandler.cacheHandler.get_datasource")
     def test_cache_realtime_data_no_online_stations(
         self,
@@ -376,6 +458,44 @@ class TestCacheHandler:
 
         assert read_data == data_to_write
 
+    def test_write_cache_compact_unless_pretty(
+        self,
+        cache_handler,
+        temp_cache_dir
+    ):
+        """
+        Test that cache files are written without indentation unless the handler is pretty.
+        """
+        data_to_write = {"key": "value", "arr": [1, 2, 3]}
+
+        cache_handler._write_cache(data_to_write, "compact.json")
+        assert "\n" not in (temp_cache_dir / "compact.json").read_text()
+
+        cache_handler.pretty = True
+        cache_handler._write_cache(data_to_write, "pretty.json")
+        assert "\n" in (temp_cache_dir / "pretty.json").read_text()
+        assert cache_handler._read_cache("pretty.json") == data_to_write
+
+    def test_is_known_station(self, cache_handler, mock_config_handler):
+        """
+        Test that is_known_station checks the station configuration.
+        """
+        mock_config_handler.get_metadata.side_effect = lambda station_id: {"id": station_id} if station_id == "station1" else None
+
+        assert cache_handler.is_known_station("station1")
+        assert not cache_handler.is_known_station("unknown")
+        assert not cache_handler.is_known_station("")
+
+    def test_is_known_station_type(self, cache_handler, mock_config_handler):
+        """
+        Test that is_known_station_type accepts "all" and the types of the configured stations.
+        """
+        mock_config_handler.get_station_types.return_value = frozenset({"fixed"})
+
+        assert cache_handler.is_known_station_type("all")
+        assert cache_handler.is_known_station_type("fixed")
+        assert not cache_handler.is_known_station_type("unknown")
+
     def test_delete_path(
         self,
         cache_handler,
@@ -7,7 +7,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../.
 import pytest
 import json
 from unittest.mock import patch, mock_open, MagicMock
-from source.configHandler.confighandler import ConfigHandler, StationNotFoundError
+from source.configHandler.confighandler import ConfigHandler, StationNotFoundError, CONFIG_CHECK_INTERVAL
 from source.logger.logger import Logger
 
 
@@ -66,6 +66,52 @@ def test_load_config(mock_open_func, config_handler, mock_config_files):
     assert any(config["id"] == "station_003" for config in configs)
 
 
+def test_load_config_reuses_unchanged_files(config_handler, tmp_path):
+    """
+    Test that unchanged configuration files give the same combined list and index.
+    """
+    fixed_file = tmp_path / "fixed_stations.json"
+    fixed_file.write_text(json.dumps([{"id": "station_001"}, {"id": "station_002"}]))
+    config_handler.config_files = [str(fixed_file)]
+
+    configs = config_handler._load_config()
+
+    assert config_handler._load_config() is configs
+    assert config_handler._index_configs(configs) is config_handler._index_configs(configs)
+    assert config_handler.get_metadata("station_002") == {"id": "station_002", "type": "fixed"}
+
+
+def test_get_station_types(config_handler, tmp_path):
+    """
+    Test that get_station_types returns the types of the configured stations.
+    """
+    fixed_file = tmp_path / "fixed_stations.json"
+    fixed_file.write_text(json.dumps([{"id": "station_001"}]))
+    mobile_file = tmp_path / "mobile_stations.json"
+    mobile_file.write_text(json.dumps([{"id": "boat_001"}]))
+    config_handler.config_files = [str(fixed_file), str(mobile_file)]
+
+    assert config_handler.get_station_types() == frozenset({"fixed", "mobile"})
+
+
+def test_load_config_checks_files_once_per_interval(config_handler, tmp_path):
+    """
+    Test that the configuration files are only checked again after CONFIG_CHECK_INTERVAL seconds.
+    """
+    fixed_file = tmp_path / "fixed_stations.json"
+    fixed_file.write_text(json.dumps([{"id": "station_001"}]))
+    config_handler.config_files = [str(fixed_file)]
+
+    configs = config_handler._load_config()
+    with patch("os.path.getmtime", side_effect=AssertionError("file checked again")):
+        assert config_handler._load_config() is configs
+
+    fixed_file.write_text(json.dumps([{"id": "station_001"}, {"id": "station_002"}]))
+    os.utime(fixed_file, (0, 0))
+    config_handler._configs_checked_at -= CONFIG_CHECK_INTERVAL
+    assert len(config_handler._load_config()) == 2
+
+
 @patch.object(ConfigHandler, "_load_config")
 def test_get_variable(mock_load_config, config_handler):
     """
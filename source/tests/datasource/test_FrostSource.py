@@ -222,6 +222,37 @@ def test_transform_timeseries_data(frost_source):
     )
     assert result == {'id': station_id, 'timeseries': expected_timeseries}
 
+def test_transform_timeseries_data_merges_sensors(frost_source):
+    """
+    Test that entries of several sensors at the same time give a single record.
+    """
+    raw_data = {
+        'data': [
+            {
+                'sourceId': 'SN18700:0',
+                'referenceTime': '2023-01-01T00:00:00Z',
+                'observations': [{'elementId': 'temperature', 'value': 5.0}]
+            },
+            {
+                'sourceId': 'SN18700:1',
+                'referenceTime': '2023-01-01T00:00:00Z',
+                'observations': [
+                    {'elementId': 'temperature', 'value': 7.0},
+                    {'elementId': 'humidity', 'value': 80.0}
+                ]
+            }
+        ]
+    }
+    frost_source.config.get_variable.return_value = {
+        'airTemperature': 'temperature',
+        'humidity': 'humidity'
+    }
+
+    df = frost_source.transform_timeseries_data(raw_data, 'SN18700', return_df=True, resample="AUTO")
+
+    assert len(df) == 1
+    assert df.iloc[0].to_dict() == {'airTemperature': 5.0, 'humidity': 80.0}
+
 def test_transform_timeseries_data_error(frost_source):
     """
     Test transforming raw timeseries data with an error.
@@ -381,3 +412,36 @@ def test_is_station_online_invalid_timestamp(frost_source):
     with patch.object(frost_source, "fetch_realtime_data", return_value=mock_data):
         assert frost_source.is_station_online(station_id, max_inactive_minutes=120) is False
         frost_source.logger.error.assert_called()
+
+@patch('requests.Session.get')
+def test_fetch_realtime_data_batch(mock_get, frost_source):
+    """
+    Test fetching the real-time data of several stations with a single request.
+    """
+    frost_source.config.get_variable.side_effect = lambda station_id: {
+        'SN18700': {'temperature': 'air_temperature'},
+        'SN99840': {'temperature': 'air_temperature', 'windSpeed': 'wind_speed'},
+    }.get(station_id)
+
+    mock_response = MagicMock()
+    mock_response.json.return_value = {
+        'data': [
+            {'sourceId': 'SN18700:0', 'referenceTime': '2025-02-08T17:00:00.000Z',
+             'observations': [{'elementId': 'air_temperature', 'value': -5.4}]},
+            {'sourceId': 'SN99840:0', 'referenceTime': '2025-02-08T17:00:00.000Z',
+             'observations': [{'elementId': 'air_temperature', 'value': -7.1},
+                              {'elementId': 'wind_speed', 'value': 3.2}]},
+        ]
+    }
+    mock_get.return_value = mock_response
+
+    result = frost_source.fetch_realtime_data_batch(['SN18700', 'SN99840', 'SN00000'])
+
+    mock_get.assert_called_once_with(
+        f"{frost_source.BASE_URL}/observations/v0.jsonld",
+        params={'sources': 'SN18700,SN99840,SN00000', 'elements': 'air_temperature,wind_speed',
+                'referencetime': 'latest'})
+    assert result['SN18700']['timeseries'][0]['temperature'] == -5.4
+    assert result['SN99840']['timeseries'][0] == {
+        'timestamp': '2025-02-08T17:00:00.000Z', 'temperature': -7.1, 'windSpeed': 3.2}
+    assert result['SN00000'] is None
@@ -168,3 +168,22 @@ def test_transform_realtime_data(mock_config_handler):
 
 
 
+
+@patch("netCDF4.Dataset")
+def test_load_file_reuses_open_dataset(mock_dataset, mock_config_handler, mock_netcdf_dataset):
+    """
+    Test that _load_file keeps the dataset open and reuses it for the same URL.
+    """
+    mock_dataset.return_value = mock_netcdf_dataset
+
+    datasource = IWINFixedSource()
+    datasource.config = mock_config_handler
+
+    first = datasource._load_file("station_123", old=0)
+    second = datasource._load_file("station_123", old=0)
+
+    assert first is second
+    mock_dataset.assert_called_once()
+
+    datasource.close()
+    mock_netcdf_dataset.close.assert_called_once()
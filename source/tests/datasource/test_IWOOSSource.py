@@ -275,4 +275,72 @@ def test_is_station_online_recent_timestamp(mock_read_csv, iwoos_source):
     is_online = iwoos_source.is_station_online(station_id, max_inactive_minutes)
 
     # Assertions
-    assert is_online is True, "Should return True when the latest timestamp is recent enough"
\ No newline at end of file
+    assert is_online is True, "Should return True when the latest timestamp is recent enough"
+
+
+# Test interpolation of the buoy position at the wave records
+@patch('pandas.read_csv')
+def test_open_data_interpolates_position_in_time(mock_read_csv, iwoos_source):
+    mock_gps_data = pd.DataFrame({
+        'time': [datetime(2023, 1, 1, 0, 0, 0), datetime(2023, 1, 1, 1, 0, 0)],
+        'lat': [60.0, 61.0],
+        'lon': [5.0, 6.0]
+    }).set_index('time')
+
+    mock_wavestat_data = pd.DataFrame({
+        'time': [datetime(2022, 12, 31, 23, 0, 0), datetime(2023, 1, 1, 0, 15, 0), datetime(2023, 1, 1, 2, 0, 0)],
+        'pHs0': [1.0, 1.1, 1.2],
+        'pT02': [2.0, 2.1, 2.2],
+        'pT24': [3.0, 3.1, 3.2]
+    }).set_index('time')
+
+    mock_read_csv.side_effect = [mock_gps_data, mock_wavestat_data]
+
+    data = iwoos_source.open_data("2025_IWOOS_id4")
+
+    assert list(data.columns) == ['pHs0', 'pT02', 'pT24', 'lat', 'lon']
+    assert pd.isna(data['lat'].iloc[0]), "No position before the first GPS fix"
+    assert data['lat'].iloc[1:].tolist() == [60.25, 61.0]
+    assert data['lon'].iloc[1:].tolist() == [5.25, 6.0]
+
+# Test that only the most recent record is kept for real-time data
+@patch('pandas.read_csv')
+def test_open_data_latest_record(mock_read_csv, iwoos_source):
+    mock_gps_data = pd.DataFrame({
+        'time': [datetime(2023, 1, 1, 0, 0, 0), datetime(2023, 1, 1, 1, 0, 0)],
+        'lat': [60.0, 61.0],
+        'lon': [5.0, 6.0]
+    }).set_index('time')
+
+    mock_wavestat_data = pd.DataFrame({
+        'time': [datetime(2023, 1, 1, 0, 45, 0), datetime(2023, 1, 1, 0, 15, 0)],
+        'pHs0': [1.0, 1.1],
+        'pT02': [2.0, 2.1],
+        'pT24': [3.0, 3.1]
+    }).set_index('time')
+
+    mock_read_csv.side_effect = [mock_gps_data, mock_wavestat_data]
+
+    data = iwoos_source.open_data("2025_IWOOS_id4", latest=True)
+
+    assert data.index.tolist() == [datetime(2023, 1, 1, 0, 45, 0)]
+    assert data['pHs0'].tolist() == [1.0]
+    assert data['lat'].tolist() == [60.75]
+
+def test_transform_realtime_data_missing_values(iwoos_source):
+    raw_data = pd.DataFrame({
+        'time': [datetime(2023, 1, 1, 0, 0, 0)],
+        'pHs0': [1.234],
+        'pT02': ['bad'],
+        'lat': [60.0],
+        'lon': [5.0]
+    }).set_index('time')
+
+    with patch.object(iwoos_source.config, 'get_variable',
+                      return_value={'waveHeight': 'pHs0', 'wavePeriod': 'pT02', 'wavePeriod24': 'pT24'}):
+        data = iwoos_source.transform_realtime_data(raw_data, "2025_IWOOS_id4")
+
+    observation = data["timeseries"][0]
+    assert observation["waveHeight"] == 1.23
+    assert observation["wavePeriod"] == 'NA'
+    assert observation["wavePeriod24"] == 'NA'
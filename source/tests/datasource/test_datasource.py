@@ -97,6 +97,13 @@ def test_handle_error(mock_error, data_source):
     mock_error.assert_called_once_with("Error occurred: Test error")
 
 
+# Test for the reverse variable lookup
+def test_element_lookup(data_source):
+    """Test that element IDs map back to the first variable using them."""
+    mapping = {"airTemperature": "air_temperature", "seaSurfaceTemperature": None, "temp": "air_temperature"}
+    assert data_source._element_lookup(mapping) == {"air_temperature": "airTemperature"}
+
+
 # Test for df_to_timeserie method
 def test_df_to_timeserie(data_source):
     """Test conversion of DataFrame to time series observations."""
@@ -169,6 +176,38 @@ def test_df_to_timeserie_with_location(data_source):
     # Assert the result
     assert result == expected_result
 
+# Test for missing positions in a track
+def test_df_to_timeserie_with_missing_location(data_source):
+    """Test that rows without a valid position do not get a location."""
+    data = {
+        'timestamp': pd.to_datetime(['2025-02-08T17:00:00.000', '2025-02-08T18:00:00.000']),
+        'airTemperature': [-5.4, -5.8],
+        'latitude': [78.123456, float('nan')],
+        'longitude': [15.654321, 15.6]
+    }
+    df = pd.DataFrame(data).set_index('timestamp')
+
+    result = data_source.df_to_timeserie(df)
+
+    assert result[0]["location"] == {"lat": 78.1235, "lon": 15.6543}
+    assert "location" not in result[1]
+
+# Test for missing values
+def test_df_to_timeserie_with_missing_values(data_source):
+    """Test that values are rounded and missing values are converted to None."""
+    data = {
+        'timestamp': pd.to_datetime(['2025-02-08T17:00:00.000', '2025-02-08T18:00:00.000']),
+        'airTemperature': [-5.456, float('nan')],
+        'windSpeed': [7, 6.1]
+    }
+    df = pd.DataFrame(data).set_index('timestamp')
+
+    result = data_source.df_to_timeserie(df)
+
+    assert result[0]["airTemperature"] == -5.46
+    assert result[0]["windSpeed"] == 7.0
+    assert result[1]["airTemperature"] is None
+
 # Test for error handling
 @patch.object(DataSource, '_handle_error')
 def test_df_to_timeserie_error_handling(mock_handle_error, data_source):
@@ -187,4 +226,35 @@ def test_df_to_timeserie_error_handling(mock_handle_error, data_source):
 
     # Assert that _handle_error was called and the result is None
     mock_handle_error.assert_called_once()
-    assert result is None
\ No newline at end of file
+    assert result is None
+
+
+def test_df_to_timeserie_timestamps(data_source):
+    """Test that timestamps are truncated to the millisecond and keep the wall time of aware indexes."""
+    index = pd.to_datetime(['2025-02-08T17:00:00.123456', '2025-02-08T18:30:05.000000']).tz_localize('UTC')
+    df = pd.DataFrame({'airTemperature': [-5.4, -5.5]}, index=index)
+
+    result = data_source.df_to_timeserie(df)
+
+    assert [obs['timestamp'] for obs in result] == ['2025-02-08T17:00:00.123Z', '2025-02-08T18:30:05.000Z']
+
+def test_create_session_sets_timeout_and_retries():
+    """Test that API sessions retry failed requests and apply a default timeout."""
+    from source.datasource.datasource import REQUEST_TIMEOUT, REQUEST_RETRIES
+
+    session = DataSource._create_session(auth=('key', ''))
+
+    assert session.auth == ('key', '')
+    assert session.get_adapter('https://frost.met.no').max_retries.total == REQUEST_RETRIES
+
+    with patch('requests.Session.send') as mock_send:
+        session.get('https://frost.met.no/sources/v0.jsonld')
+        assert mock_send.call_args.kwargs['timeout'] == REQUEST_TIMEOUT
+
+def test_close_releases_session(data_source):
+    """Test that closing a data source closes its HTTP session."""
+    data_source.session = DataSource._create_session()
+
+    with patch.object(data_source.session, 'close') as mock_close:
+        data_source.close()
+        mock_close.assert_called_once()
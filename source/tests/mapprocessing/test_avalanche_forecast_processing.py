@@ -104,3 +104,62 @@ def test_process_3003(avalanche_processor):
         mock_fetch_region.assert_called_once()
         mock_fetch_forecast.assert_called_once()
         mock_create_layer.assert_called_once()
+
+def test_process_3003_skips_recent_layer(avalanche_processor, tmp_path):
+    avalanche_processor.export_directory = str(tmp_path)
+    (tmp_path / "0.geojson").write_text("{}")
+
+    with patch.object(avalanche_processor, 'fetch_region_data') as mock_fetch_region, \
+         patch.object(avalanche_processor, 'fetch_forecast_data') as mock_fetch_forecast, \
+         patch.object(avalanche_processor, '_create_forecast_layer_region') as mock_create_layer:
+
+        avalanche_processor.process_3003()
+        mock_fetch_region.assert_not_called()
+        mock_fetch_forecast.assert_not_called()
+        mock_create_layer.assert_not_called()
+
+        avalanche_processor.process_3003(force=True)
+        mock_fetch_region.assert_called_once()
+
+def test_process_3003_ignores_layer_of_previous_day(avalanche_processor, tmp_path):
+    avalanche_processor.export_directory = str(tmp_path)
+    layer = tmp_path / "0.geojson"
+    layer.write_text("{}")
+    yesterday = (datetime.now() - timedelta(days=1)).timestamp()
+    os.utime(layer, (yesterday, yesterday))
+
+    with patch.object(avalanche_processor, 'fetch_region_data') as mock_fetch_region, \
+         patch.object(avalanche_processor, 'fetch_forecast_data'), \
+         patch.object(avalanche_processor, '_create_forecast_layer_region'):
+
+        avalanche_processor.process_3003(max_age_minutes=2 * 24 * 60)
+        mock_fetch_region.assert_called_once()
+
+def test_create_geojson_from_dicts_merges_polygons(avalanche_processor):
+    from shapely.geometry import MultiPolygon, Point
+
+    square = Polygon([(500000, 8600000), (501000, 8600000), (501000, 8601000), (500000, 8601000)])
+    shifted = Polygon([(502000, 8600000), (503000, 8600000), (503000, 8601000), (502000, 8601000)])
+    gdf = gpd.GeoDataFrame(geometry=[square, MultiPolygon([shifted, square]), Point(500000, 8600000)], crs="EPSG:32633")
+
+    result = avalanche_processor._create_geojson_from_dicts([{'gdf': gdf, 'label': 'Wind slab', 'description': 'test'}])
+
+    assert len(result['features']) == 1
+    feature = result['features'][0]
+    assert feature['properties']['name'] == 'Wind slab'
+    assert feature['geometry']['type'] == 'MultiPolygon'
+    assert len(feature['geometry']['coordinates']) == 3
+    lon, lat = feature['geometry']['coordinates'][0][0][0]
+    assert 14 < lon < 16 and 77 < lat < 78
+
+def test_save_geojson_to_file_writes_gzip_copy(avalanche_processor, tmp_path):
+    import gzip
+
+    avalanche_processor.export_directory = str(tmp_path)
+    geojson_obj = {"type": "FeatureCollection", "features": []}
+
+    avalanche_processor._save_geojson_to_file(geojson_obj, 0)
+
+    assert json.loads((tmp_path / "0.geojson").read_text()) == geojson_obj
+    with gzip.open(tmp_path / "0.geojson.gz") as f:
+        assert json.load(f) == geojson_obj
@@ -3,6 +3,7 @@ import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
 
+import io
 import pytest
 import os
 import requests
@@ -29,3 +30,153 @@ def test_create_ice_chart_geojson_recent_file(sea_ice_cache):
 
         geojson_path = sea_ice_cache.create_ice_chart_geojson()
         assert geojson_path == './test_output/ice_chart.geojson'
+
+
+def test_download_retries_server_errors(sea_ice_cache, tmp_path):
+    failed = MagicMock(status_code=503)
+    succeeded = MagicMock(status_code=200)
+    succeeded.raw = io.BytesIO(b"data")
+    file_path = tmp_path / "chart.zip"
+
+    with patch('requests.Session.get', side_effect=[requests.ConnectionError(), failed, succeeded]) as mock_get, \
+         patch('time.sleep') as mock_sleep:
+        sea_ice_cache._download("https://example.com/chart.zip", str(file_path))
+
+    assert mock_get.call_count == 3
+    assert mock_sleep.call_count == 2
+    assert file_path.read_bytes() == b"data"
+    failed.close.assert_called_once()
+    succeeded.close.assert_called_once()
+
+
+def test_download_does_not_retry_client_errors(sea_ice_cache, tmp_path):
+    with patch('requests.Session.get', return_value=MagicMock(status_code=404)) as mock_get, \
+         patch('time.sleep') as mock_sleep:
+        with pytest.raises(Exception, match="404"):
+            sea_ice_cache._download("https://example.com/chart.zip", str(tmp_path / "chart.zip"))
+
+    assert mock_get.call_count == 1
+    mock_sleep.assert_not_called()
+
+
+def test_create_ice_chart_geojson_dissolves_classes(tmp_path):
+    import json
+    import zipfile
+
+    gdf = gpd.GeoDataFrame({
+        "NIS_CLASS": ["Fast Ice", "Open Water", "Fast Ice", "Ice Free"],
+        "geometry": [box(10, 78, 11, 79), box(12, 78, 13, 79), box(11, 78, 12, 79), box(14, 78, 15, 79)],
+    }, crs="EPSG:4326")
+    shapefile = tmp_path / "NIS_arctic_20250101_pl_a.shp"
+    gdf.to_file(shapefile)
+    zip_path = tmp_path / "chart.zip"
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        for part in tmp_path.glob("NIS_arctic_20250101_pl_a.*"):
+            archive.write(part, part.name)
+
+    cache = SeaIceCache(output_dir=str(tmp_path / "out"))
+    cache.serve_only = False
+    with patch.object(cache, '_download', side_effect=lambda url, path: os.replace(zip_path, path)), \
+         patch.object(cache, 'clip_and_mask_water_area', side_effect=lambda frame: frame):
+        geojson_path = cache.create_ice_chart_geojson(force=True)
+
+    with open(geojson_path) as f:
+        geojson = json.load(f)
+    assert [feature["properties"]["name"] for feature in geojson["features"]] == ["Fast Ice", "Open Water"]
+    assert geojson["features"][0]["geometry"]["type"] == "Polygon"
+    assert geojson["date"] == "2025-01-01T00:00:00"
+
+
+def test_clip_and_mask_water_area_removes_land(tmp_path):
+    import shapely
+
+    land = gpd.GeoDataFrame(geometry=[box(10, 78, 11, 79), box(11, 78, 12, 79), box(30, 80, 31, 81)], crs="EPSG:4326")
+    land.to_file(tmp_path / "land.shp")
+    ice = gpd.GeoDataFrame({
+        "NIS_CLASS": ["Fast Ice", "Open Water", "Close Drift Ice"],
+        "geometry": [box(9, 78, 13, 79), box(20, 76, 21, 77), box(10.2, 78.2, 10.8, 78.8)],
+    }, crs="EPSG:4326")
+
+    cache = SeaIceCache(output_dir=str(tmp_path / "out"), shapefile_path=str(tmp_path / "land.shp"))
+    water = cache.clip_and_mask_water_area(ice)
+
+    expected = gpd.overlay(ice, land, how="difference")
+    def summary(frame):
+        return sorted(zip(frame["NIS_CLASS"], frame.geom_type, shapely.area(frame.geometry.to_numpy()).round(6)))
+
+    assert summary(water) == summary(expected)
+    assert water.index.tolist() == [0, 1]
+
+
+def test_clip_and_mask_water_area_keeps_equivalent_crs(tmp_path):
+    land = gpd.GeoDataFrame(geometry=[box(10, 78, 11, 79)], crs="EPSG:4326")
+    land.to_file(tmp_path / "land.shp")
+    ice = gpd.GeoDataFrame({"NIS_CLASS": ["Fast Ice"], "geometry": [box(9, 78, 13, 79)]}, crs="EPSG:4326")
+
+    cache = SeaIceCache(output_dir=str(tmp_path / "out"), shapefile_path=str(tmp_path / "land.shp"))
+    with patch.object(gpd.GeoDataFrame, 'to_crs', side_effect=AssertionError("land reprojected")):
+        water = cache.clip_and_mask_water_area(ice)
+
+    assert water.crs == ice.crs
+    assert len(water) == 1
+
+
+def test_clip_and_mask_water_area_reuses_land(tmp_path):
+    land = gpd.GeoDataFrame(geometry=[box(10, 78, 11, 79)], crs="EPSG:4326")
+    land.to_file(tmp_path / "land.shp")
+    ice = gpd.GeoDataFrame({"NIS_CLASS": ["Fast Ice"], "geometry": [box(9, 78, 13, 79)]}, crs="EPSG:4326")
+
+    cache = SeaIceCache(output_dir=str(tmp_path / "out"), shapefile_path=str(tmp_path / "land.shp"))
+    first = cache.clip_and_mask_water_area(ice)
+    with patch('geopandas.read_file', side_effect=AssertionError("land read again")):
+        second = cache.clip_and_mask_water_area(ice)
+
+    assert first.geometry.equals(second.geometry)
+
+
+def test_load_land_repairs_invalid_polygons(tmp_path):
+    from shapely.geometry import Polygon
+
+    bowtie = Polygon([(10, 78), (11, 79), (11, 78), (10, 79)])
+    land = gpd.GeoDataFrame(geometry=[bowtie, box(12, 78, 13, 79)], crs="EPSG:4326")
+    land.to_file(tmp_path / "invalid_land.shp")
+
+    cache = SeaIceCache(output_dir=str(tmp_path / "out"), shapefile_path=str(tmp_path / "invalid_land.shp"))
+    land_gdf = cache._load_land(land.crs)
+
+    assert land_gdf.is_valid.all()
+    assert len(land_gdf) == 2
+
+
+def test_clip_and_mask_water_area_keeps_inner_polygons(tmp_path):
+    land = gpd.GeoDataFrame(geometry=[box(30, 80, 31, 80.5)], crs="EPSG:4326")
+    land.to_file(tmp_path / "far_land.shp")
+    inner = box(10, 77, 12, 78)
+    ice = gpd.GeoDataFrame({"NIS_CLASS": ["Fast Ice", "Open Water", "Very Open Drift Ice"],
+                            "geometry": [inner, box(5, 75, 9, 76), box(40, 60, 41, 61)]}, crs="EPSG:4326")
+
+    cache = SeaIceCache(output_dir=str(tmp_path / "out"), shapefile_path=str(tmp_path / "far_land.shp"))
+    with patch('geopandas.clip', wraps=gpd.clip) as mock_clip:
+        result = cache.clip_and_mask_water_area(ice)
+
+    assert len(mock_clip.call_args.args[0]) == 2
+    assert sorted(result["NIS_CLASS"]) == ["Fast Ice", "Open Water"]
+    assert result.loc[result["NIS_CLASS"] == "Fast Ice", "geometry"].iloc[0].equals(inner)
+    assert result.loc[result["NIS_CLASS"] == "Open Water", "geometry"].iloc[0].equals(box(7.5, 75, 9, 76))
+
+
+def test_feature_collection_bytes_matches_mapping():
+    import json
+    from shapely.geometry import mapping
+    from source.maps_processing.sea_ice_map_processing import feature_collection_bytes
+
+    geometries = [box(10, 78, 11, 79), box(12, 78, 13, 79).union(box(14, 78, 15, 79))]
+    features = [{"type": "Feature", "properties": {"name": name}} for name in ("a", "b")]
+
+    encoded = feature_collection_bytes({"type": "FeatureCollection", "date": "2025-01-01"}, features, geometries)
+
+    assert json.loads(encoded) == json.loads(json.dumps({
+        "type": "FeatureCollection",
+        "date": "2025-01-01",
+        "features": [{**feature, "geometry": mapping(geometry)} for feature, geometry in zip(features, geometries)],
+    }))